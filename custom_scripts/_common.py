@@ -0,0 +1,186 @@
+"""
+SO-101 Follower Arm Test Helpers
+
+Shared setup for the follower arm movement scripts (move_all_joints.py, move_larger_range.py,
+move_gripper.py and move_follower_arm.py):
+
+1. Builds the FeetechMotorsBus config for the follower arm
+2. Connects, reads the initial positions with one sync read and enables torque
+3. Disables torque and disconnects on exit, even if the test fails part way through
+4. Wraps the bus in an AsyncBus so the scripts can await bus I/O from asyncio
+5. Talks to motor_daemon.py through a RemoteBus instead when the daemon is running, which
+   skips opening the serial port on every run
+
+Usage:
+    from _common import AsyncBus, open_arm
+
+    with open_arm() as (motors_bus, initial_positions):
+        bus = AsyncBus(motors_bus)
+        ...
+"""
+
+import asyncio
+import json
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from lerobot.common.robot_devices.motors.feetech import FeetechMotorsBus
+from lerobot.common.robot_devices.motors.configs import FeetechMotorsBusConfig
+
+log = logging.getLogger(__name__)
+
+FOLLOWER_PORT = "COM4"  # Port for follower arm
+
+# Motor IDs of the follower arm, by joint name
+FOLLOWER_MOTORS = {
+    "shoulder_pan": 1,
+    "shoulder_lift": 2,
+    "elbow_flex": 3,
+    "wrist_flex": 4,
+    "wrist_roll": 5,
+    "gripper": 6,
+}
+DEFAULT_NAMES = tuple(FOLLOWER_MOTORS)
+
+# Where motor_daemon.py listens for RemoteBus clients
+DAEMON_ADDRESS = ("127.0.0.1", 50007)
+DAEMON_CONNECT_TIMEOUT = 0.2  # seconds; a refused localhost connection fails well before this
+
+def connect_follower_bus(port=FOLLOWER_PORT, names=DEFAULT_NAMES):
+    """Open the serial port and return a connected FeetechMotorsBus for the given follower motors"""
+    motors_config = {name: (FOLLOWER_MOTORS[name], "sts3215") for name in names}
+    motors_bus = FeetechMotorsBus(FeetechMotorsBusConfig(port=port, motors=motors_config))
+    motors_bus.connect()
+    log.info("Connected to motors bus on %s", port)
+    return motors_bus
+
+class RemoteBus:
+    """Stand-in for FeetechMotorsBus that forwards read/write to motor_daemon.py
+
+    Requests and replies are one JSON object per line. Motor names default to the ones this
+    client was opened with, since the daemon's bus always holds the whole arm.
+    """
+
+    def __init__(self, names=DEFAULT_NAMES, address=DAEMON_ADDRESS):
+        self.motor_names = list(names)
+        self.address = address
+        self.is_connected = False
+
+    def connect(self):
+        self._sock = socket.create_connection(self.address, timeout=DAEMON_CONNECT_TIMEOUT)
+        self._sock.settimeout(None)
+        self._file = self._sock.makefile("rwb")
+        self.is_connected = True
+        log.info("Connected to motor daemon on %s:%s", *self.address)
+
+    def disconnect(self):
+        self._file.close()
+        self._sock.close()
+        self.is_connected = False
+
+    def _request(self, **request):
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        reply = json.loads(self._file.readline())
+        if "error" in reply:
+            # Keep bus errors as ConnectionError so the scripts handle them as before
+            error_type = ConnectionError if reply["type"] == "ConnectionError" else RuntimeError
+            raise error_type(reply["error"])
+        return reply["result"]
+
+    def read(self, data_name, motor_names=None):
+        motor_names = self.motor_names if motor_names is None else motor_names
+        return np.array(self._request(op="read", data_name=data_name, motor_names=motor_names))
+
+    def write(self, data_name, values, motor_names=None):
+        motor_names = self.motor_names if motor_names is None else motor_names
+        self._request(op="write", data_name=data_name, values=np.asarray(values).tolist(), motor_names=motor_names)
+
+def connect_arm(port=FOLLOWER_PORT, names=DEFAULT_NAMES):
+    """Reuse motor_daemon.py's open bus when it is running, otherwise open the port directly"""
+    remote_bus = RemoteBus(names)
+    try:
+        remote_bus.connect()
+        return remote_bus
+    except OSError:
+        return connect_follower_bus(port, names)
+
+@contextmanager
+def open_arm(port=FOLLOWER_PORT, names=DEFAULT_NAMES):
+    """Connect to the follower arm and enable torque, yielding (motors_bus, initial_positions)
+
+    A motor whose initial position couldn't be read maps to None.
+    """
+    motors_bus = connect_arm(port, names)
+
+    try:
+        # Read initial positions for all motors with a single sync read, which also confirms that
+        # every motor responds. Only if it fails are the motors read one by one to find the missing ones.
+        try:
+            positions = motors_bus.read("Present_Position")
+            initial_positions = dict(zip(names, positions.tolist()))
+        except Exception as e:
+            log.error("Error reading initial positions: %s", e)
+            initial_positions = {}
+            for motor_name in names:
+                try:
+                    initial_positions[motor_name] = int(motors_bus.read("Present_Position", motor_name)[0])
+                except Exception as e:
+                    log.error("Error reading from %s: %s", motor_name, e)
+                    initial_positions[motor_name] = None  # Unlike 0, can't be mistaken for a reading
+        for motor_name, position in initial_positions.items():
+            log.info("Initial %s position: %s", motor_name, position)
+
+        # Enable torque for all motors with a single sync write
+        motors_bus.write("Torque_Enable", 1)
+        log.info("Torque enabled for all motors")
+
+        yield motors_bus, initial_positions
+
+    finally:
+        try:
+            motors_bus.write("Torque_Enable", 0)
+            log.info("Torque disabled for all motors")
+        except Exception as e:
+            log.error("Error disabling torque: %s", e)
+        motors_bus.disconnect()
+        log.info("Disconnected from motors bus")
+
+class AsyncBus:
+    """Awaitable reads and writes on a FeetechMotorsBus
+
+    The bus itself stays synchronous. Calls run on a single worker thread, not asyncio.to_thread's
+    shared pool, so packets on the half-duplex bus can never interleave.
+    """
+
+    def __init__(self, motors_bus):
+        self.motors_bus = motors_bus
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def read(self, data_name, motor_names=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.motors_bus.read, data_name, motor_names)
+
+    async def write(self, data_name, values, motor_names=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.motors_bus.write, data_name, values, motor_names)
+
+    def close(self):
+        self._executor.shutdown()
+
+async def wait_reached(bus, motor_names, targets, tol=5, timeout=2.0):
+    """Poll Present_Position at ~50 Hz until every motor is within tol steps of its target or timeout expires
+
+    motor_names and targets may be a single name and position, or matching sequences (one sync read per poll).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if np.all(np.abs(await bus.read("Present_Position", motor_names) - targets) <= tol):
+            return True
+        await asyncio.sleep(0.02)
+    return False
@@ -0,0 +1,138 @@
+"""
+SCServo SDK Bus Handles
+
+Shared scservo_sdk port and packet handlers for the scripts that talk to the SO-101 motors
+through the SDK (reset_follower_motors.py and so101_diagnostics.py):
+
+1. Opens each port at most once per process, however many functions ask for it
+2. Sets the baudrate and lowers the port's latency before handing the handlers out
+3. Sizes each reply timeout to the packet, the baudrate and the adapter's actual latency
+4. Closes a port and forgets its handlers, safely even if it was never opened
+5. SYNC WRITE / SYNC READ helpers and Moving-flag polling across several motors
+
+Usage:
+    from bus import get_bus, close_bus, sync_read, sync_write, wait_until_stopped
+
+    port, packet = get_bus("COM4")
+    sync_write(port, packet, 42, 2, {1: 2048, 2: 2048})
+    wait_until_stopped(port, packet, [1, 2])
+    close_bus("COM4")
+"""
+
+import sys
+import time
+
+import scservo_sdk as scs
+
+from scs_protocol import LATENCY_TIMER_MS, set_port_low_latency
+
+BAUDRATE = 1000000
+PROTOCOL = 0  # Protocol 0 for SCServo SCS
+DEFAULT_LATENCY_MS = 16  # FTDI adapters' default latency timer, which scservo_sdk always assumes
+
+ADDR_MOVING = 66  # Moving flag, 1 while travelling to a goal
+MOVE_TIMEOUT = 1.0  # Upper bound on waiting for a move to finish (seconds)
+MOVE_POLL_INTERVAL = 0.01  # How often wait_until_stopped reads the Moving flag
+MOVE_START_GRACE = 0.1  # A motor may still report idle this long after a goal write, before it starts
+
+def packet_timeout_ms(packet_length, baudrate=BAUDRATE, latency_ms=DEFAULT_LATENCY_MS):
+    """How long to wait for a reply of packet_length bytes: its wire time plus the adapter's latency
+
+    The latency is counted twice, once for the request and once for the reply, plus 2 ms of slack
+    for the servo's processing.
+    """
+    return packet_length * 10 * 1000 / baudrate + 2 * latency_ms + 2.0
+
+class PortHandler(scs.PortHandler):
+    """scservo_sdk PortHandler whose reply timeouts use the adapter's actual latency timer
+
+    The SDK assumes a 16 ms latency timer for every timeout it sets. Once the timer is lowered, a
+    dropped reply would still hold up each request for over 34 ms, so get_bus sets latency_ms to
+    the value in effect.
+    """
+
+    def __init__(self, port_name):
+        super().__init__(port_name)
+        self.latency_ms = DEFAULT_LATENCY_MS
+
+    def setPacketTimeout(self, packet_length):  # noqa: N802
+        self.packet_start_time = self.getCurrentTime()
+        self.packet_timeout = packet_timeout_ms(packet_length, self.baudrate, self.latency_ms)
+
+# Open (port, packet) handlers by port name
+_buses = {}
+
+def get_bus(port_name, baudrate=BAUDRATE):
+    """Return the (port, packet) handlers of port_name, opening the port on first use
+
+    Raises ConnectionError if the port can't be opened or set to baudrate; nothing is kept then,
+    so a later call tries again.
+    """
+    if port_name in _buses:
+        return _buses[port_name]
+
+    port = PortHandler(port_name)
+    if not port.openPort():
+        raise ConnectionError(f"Failed to open port {port_name}")
+    if not port.setBaudRate(baudrate):
+        port.closePort()
+        raise ConnectionError(f"Failed to change the baudrate of {port_name} to {baudrate}")
+
+    # Cut the adapter's per-reply latency before the first transaction. setBaudRate reopens the
+    # port, so this has to come after it. Only on Linux does the new timer apply right away; Windows
+    # picks it up once the adapter is reconnected, so until then the timeouts keep the default.
+    if set_port_low_latency(port) and sys.platform.startswith("linux"):
+        port.latency_ms = LATENCY_TIMER_MS
+
+    _buses[port_name] = port, scs.PacketHandler(PROTOCOL)
+    return _buses[port_name]
+
+def close_bus(port_name):
+    """Close port_name if get_bus opened it, returning whether it was open"""
+    bus = _buses.pop(port_name, None)
+    if bus is None:
+        return False
+    bus[0].closePort()
+    return True
+
+def sync_write(port, packet, address, length, values):
+    """Write {motor_id: value} to the same register of several motors with one SYNC WRITE packet
+
+    Returns the SDK's result code; sync writes get no reply, so success only means the packet went out.
+    """
+    group = scs.GroupSyncWrite(port, packet, address, length)
+    for motor_id, value in values.items():
+        group.addParam(motor_id, list(value.to_bytes(length, "little")))
+    return group.txPacket()
+
+def sync_read(port, packet, address, length, motor_ids):
+    """Read the same register from several motors with one SYNC READ; returns {motor_id: value}"""
+    group = scs.GroupSyncRead(port, packet, address, length)
+    for motor_id in motor_ids:
+        group.addParam(motor_id)
+    if group.txRxPacket() != scs.COMM_SUCCESS:
+        return {}
+    get_data, is_available = group.getData, group.isAvailable
+    return {
+        motor_id: get_data(motor_id, address, length)
+        for motor_id in motor_ids
+        if is_available(motor_id, address, length)
+    }
+
+def wait_until_stopped(port, packet, motor_ids, timeout=MOVE_TIMEOUT):
+    """Poll the motors' Moving flags with one SYNC READ per poll until every move has finished
+
+    Returns False if timeout expires first.
+    """
+    start_time = time.monotonic()
+    seen_moving = False
+    while time.monotonic() - start_time < timeout:
+        moving = sync_read(port, packet, ADDR_MOVING, 1, motor_ids)
+        if len(moving) == len(motor_ids):
+            all_stopped = not any(moving.values())
+            seen_moving = seen_moving or not all_stopped
+            # An idle reading right after the goal write only counts once the motors had time to start
+            if all_stopped and (seen_moving or time.monotonic() - start_time > MOVE_START_GRACE):
+                return True
+        time.sleep(MOVE_POLL_INTERVAL)
+    return False
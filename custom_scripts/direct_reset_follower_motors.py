@@ -12,143 +12,32 @@ Usage:
     python direct_reset_follower_motors.py
 """
 
-import sys
-import os
 import time
-import serial
-
-# Motor names for better readability
-MOTOR_NAMES = {
-    1: "Shoulder Pan",
-    2: "Shoulder Lift",
-    3: "Elbow Flex",
-    4: "Wrist Flex",
-    5: "Wrist Roll",
-    6: "Gripper"
-}
-
-# Port settings
-FOLLOWER_PORT = "COM4"
-BAUDRATE = 1000000
-
-# Control parameters
-MOTOR_IDS = list(range(1, 7))  # Motors 1-6
-CENTER_POSITION = 2048  # Center position (0 degree)
-
-# Key register addresses for SCServo motors
-ADDR_TORQUE_ENABLE = 0x28       # Torque enable (40)
-ADDR_PRESENT_POSITION = 0x38    # Present position (56)
-ADDR_GOAL_POSITION = 0x2A       # Goal position (42)
-ADDR_OPERATING_MODE = 0x0B      # Operating mode (11)
-ADDR_MAX_TORQUE = 0x22          # Max torque setting (34)
-ADDR_GOAL_SPEED = 0x2E          # Movement speed (46)
-ADDR_RETURN_DELAY = 0x05        # Return delay time (5)
-ADDR_ALARM_SHUTDOWN = 0x12      # Alarm shutdown flags (18)
-ADDR_LED = 0x29                 # LED control (41)
-
-def open_port():
-    """Open the serial port for communication"""
-    try:
-        # Try to open the port
-        ser = serial.Serial(FOLLOWER_PORT, BAUDRATE, timeout=0.5)
-        print(f"Successfully opened {FOLLOWER_PORT}")
-        return ser
-    except Exception as e:
-        print(f"Error opening {FOLLOWER_PORT}: {e}")
-        return None
-
-def close_port(ser):
-    """Close the serial port"""
-    if ser:
-        ser.close()
-        print(f"Closed {FOLLOWER_PORT}")
-
-def write_byte(ser, motor_id, address, value):
-    """Write a single byte to a motor register using direct serial"""
-    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 ... CHECKSUM
-    # For write (INST=0x03): ADDRESS VALUE
-    checksum = 0xFF - ((motor_id + 0x04 + 0x03 + address + value) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x03, address, value, checksum])
-
-    ser.write(packet)
-    time.sleep(0.05)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            return True, response
-        else:
-            return False, response
-    return False, None
-
-def write_word(ser, motor_id, address, value):
-    """Write a two-byte word to a motor register using direct serial"""
-    # Split value into low and high bytes
-    value_l = value & 0xFF
-    value_h = (value >> 8) & 0xFF
-
-    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 PARAM3 CHECKSUM
-    # For write (INST=0x03): ADDRESS VALUE_L VALUE_H
-    checksum = 0xFF - ((motor_id + 0x05 + 0x03 + address + value_l + value_h) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x05, 0x03, address, value_l, value_h, checksum])
-
-    ser.write(packet)
-    time.sleep(0.05)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            return True, response
-        else:
-            return False, response
-    return False, None
-
-def read_word(ser, motor_id, address, length=2):
-    """Read a two-byte word from a motor register using direct serial"""
-    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 CHECKSUM
-    # For read (INST=0x02): ADDRESS LENGTH
-    checksum = 0xFF - ((motor_id + 0x04 + 0x02 + address + length) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x02, address, length, checksum])
-
-    ser.write(packet)
-    time.sleep(0.05)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        if len(response) >= 8 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            # Extract value
-            value_l = response[5]
-            value_h = response[6]
-            value = (value_h << 8) + value_l
-            return value, True, response
-        else:
-            return 0, False, response
-    return 0, False, None
 
-def ping_motor(ser, motor_id):
-    """Ping a motor to check if it's responsive"""
-    print(f"Pinging motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')})...")
-
-    # Basic ping packet: 0xFF 0xFF ID 0x02 0x01 CHECKSUM
-    checksum = 0xFF - ((motor_id + 0x02 + 0x01) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x02, 0x01, checksum])
-
-    ser.write(packet)
-    time.sleep(0.1)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        print(f"  Response: {' '.join([hex(b) for b in response])}")
-
-        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            print(f"  ✓ Motor {motor_id} responded to ping!")
-            return True
-        else:
-            print(f"  ✗ Invalid response format")
-            return False
-    else:
-        print(f"  ✗ No response from motor {motor_id}")
-        return False
+from scs_protocol import (
+    ADDR_ALARM_SHUTDOWN,
+    ADDR_GOAL_POSITION,
+    ADDR_GOAL_SPEED,
+    ADDR_LED,
+    ADDR_MAX_TORQUE,
+    ADDR_OPERATING_MODE,
+    ADDR_PRESENT_POSITION,
+    ADDR_RETURN_DELAY,
+    ADDR_TORQUE_ENABLE,
+    CENTER_POSITION,
+    MOTOR_IDS,
+    MOTOR_NAMES,
+    broadcast_write_byte,
+    close_port,
+    open_port,
+    ping_all,
+    read_word,
+    wait_moved,
+    write_byte,
+    write_word,
+)
+
+LED_BLINK_TIME = 0.5  # How long the reset LEDs stay lit (seconds)
 
 def reset_motor(ser, motor_id):
     """Reset motor to factory defaults using a sequence of commands"""
@@ -198,19 +87,13 @@ def reset_motor(ser, motor_id):
     else:
         print(f"  ✗ Failed to reset alarm shutdown")
 
-    # 6. Blink LED to show reset
+    # 6. Light LED to show reset (the caller turns all LEDs off together once every motor is done)
     success, _ = write_byte(ser, motor_id, ADDR_LED, 1)
     if success:
         print(f"  ✓ LED turned on")
     else:
         print(f"  ✗ Failed to turn on LED")
 
-    time.sleep(0.5)
-
-    success, _ = write_byte(ser, motor_id, ADDR_LED, 0)
-    if success:
-        print(f"  ✓ LED turned off")
-
     # 7. Re-enable torque
     success, _ = write_byte(ser, motor_id, ADDR_TORQUE_ENABLE, 1)
     if success:
@@ -247,9 +130,9 @@ def test_motor_movement(ser, motor_id):
         print(f"  ✗ Failed to send move command")
         return False
 
-    # Give time to move
+    # Wait until the motor reports it has stopped
     print("  Waiting for movement...")
-    time.sleep(1.0)
+    wait_moved(ser, [motor_id])
 
     # Read new position
     new_pos, success, _ = read_word(ser, motor_id, ADDR_PRESENT_POSITION)
@@ -272,7 +155,7 @@ def test_motor_movement(ser, motor_id):
     if moved:
         print(f"  Returning to original position {current_pos}...")
         success, _ = write_word(ser, motor_id, ADDR_GOAL_POSITION, current_pos)
-        time.sleep(1.0)
+        wait_moved(ser, [motor_id])
 
     return moved
 
@@ -308,10 +191,7 @@ def perform_reset_sequence():
     try:
         # Step 1: Ping all motors to check basic communication
         print("\n=== Testing Basic Communication ===")
-        responsive_motors = []
-        for motor_id in MOTOR_IDS:
-            if ping_motor(ser, motor_id):
-                responsive_motors.append(motor_id)
+        responsive_motors = ping_all(ser, MOTOR_IDS)
 
         if not responsive_motors:
             print("\nNo motors responding. Check physical connections and power.")
@@ -326,6 +206,11 @@ def perform_reset_sequence():
             if reset_motor(ser, motor_id):
                 reset_motors.append(motor_id)
 
+        # The LEDs stay lit while the following motors are reset, so one blink dwell covers them all
+        time.sleep(LED_BLINK_TIME)
+        broadcast_write_byte(ser, ADDR_LED, 0)
+        print("LEDs turned off")
+
         print(f"\nSuccessfully reset motors: {reset_motors}")
 
         # Step 3: Test movement on all reset motors
@@ -344,7 +229,7 @@ def perform_reset_sequence():
                 center_motor(ser, motor_id)
 
             print("\nWaiting for centering to complete...")
-            time.sleep(2.0)
+            wait_moved(ser, moving_motors, timeout=2.0)
 
         # Final report
         print("\n=== Reset Process Complete ===")
@@ -5,157 +5,90 @@ This script just tries a few simple operations to verify basic communication
 with the follower arm and attempt to enable torque on the motors.
 """
 
-import sys
-import os
-import time
-
-# Add the parent directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-try:
-    import scservo_sdk as scs
-    print("Successfully imported scservo_sdk")
-except ImportError:
-    print("Failed to import scservo_sdk. Make sure it's installed.")
-    sys.exit(1)
-
-# Port settings
-FOLLOWER_PORT = "COM4"
-BAUDRATE = 1000000
-PROTOCOL = 0  # Protocol 0 for SCServo SCS
-
-# Motor IDs
-MOTOR_IDS = list(range(1, 7))  # Motors 1-6
-
-# Initialize port handlers
-port_handler = scs.PortHandler(FOLLOWER_PORT)
-packet_handler = scs.PacketHandler(PROTOCOL)
-
-def open_port():
-    """Open the follower port"""
-    try:
-        if port_handler.openPort():
-            print(f"✓ Successfully opened port {FOLLOWER_PORT}")
-        else:
-            print(f"✗ Failed to open port {FOLLOWER_PORT}")
-            return False
-
-        if port_handler.setBaudRate(BAUDRATE):
-            print(f"✓ Changed baudrate to {BAUDRATE}")
-        else:
-            print(f"✗ Failed to change baudrate")
-            port_handler.closePort()
-            return False
+from scs_protocol import (
+    ADDR_GOAL_POSITION,
+    ADDR_PRESENT_POSITION,
+    ADDR_TORQUE_ENABLE,
+    CENTER_POSITION,
+    MOTOR_IDS,
+    close_port,
+    open_port,
+    ping_all,
+    read_word,
+    sync_read,
+    sync_read_word,
+    sync_write_byte,
+    sync_write_word,
+    wait_moved,
+)
+
+def try_enable_torque(ser, motor_ids):
+    """Try to enable torque on several motors with one sync write per state"""
+    print(f"Enabling torque on motors {motor_ids}...")
 
-        return True
-    except Exception as e:
-        print(f"✗ Error with port: {e}")
-        return False
-
-def reboot_motor(motor_id):
-    """Try to reboot the motor"""
-    print(f"Attempting to reboot motor {motor_id}...")
     try:
-        # The reboot command can vary by servo model, trying common ones
-        result, error = packet_handler.reboot(port_handler, motor_id)
-        if result == scs.COMM_SUCCESS:
-            print(f"  ✓ Successfully sent reboot command to motor {motor_id}")
-            return True
-        else:
-            print(f"  ✗ Failed to reboot motor {motor_id}: {packet_handler.getTxRxResult(result)}")
-            return False
+        # Disable first (sometime helps reset state). The motors execute instructions in
+        # the order they arrive, so the enable packet can follow immediately without a settle wait.
+        sync_write_byte(ser, motor_ids, ADDR_TORQUE_ENABLE, [0] * len(motor_ids))
+        sync_write_byte(ser, motor_ids, ADDR_TORQUE_ENABLE, [1] * len(motor_ids))
+
+        # Sync writes get no reply, so read Torque_Enable back to see which motors took it
+        torque = sync_read(ser, motor_ids, ADDR_TORQUE_ENABLE, 1)
+        enabled = [motor_id for motor_id in motor_ids if torque.get(motor_id) == 1]
+        for motor_id in motor_ids:
+            if motor_id in enabled:
+                print(f"  ✓ Motor {motor_id} torque enabled")
+            else:
+                print(f"  ✗ Motor {motor_id} did not confirm torque enable")
+        return enabled
     except Exception as e:
-        print(f"  ✗ Exception rebooting motor {motor_id}: {e}")
-        return False
-
-def ping_motor(motor_id):
-    """Ping a motor to check if it's responsive"""
-    print(f"Pinging motor {motor_id}...")
-
-    try:
-        comm_result = packet_handler.ping(port_handler, motor_id)
-        if comm_result[0] == scs.COMM_SUCCESS:
-            print(f"  ✓ Motor {motor_id} responded to ping! Model: {comm_result[1]}")
-            return True
-        else:
-            print(f"  ✗ Failed to ping motor {motor_id}: {packet_handler.getTxRxResult(comm_result[0])}")
-            return False
-    except Exception as e:
-        print(f"  ✗ Exception pinging motor {motor_id}: {e}")
-        return False
+        print(f"  ✗ Exception enabling torque: {e}")
+        return []
 
-def try_enable_torque(motor_id):
-    """Try to enable torque on a motor"""
-    print(f"Enabling torque on motor {motor_id}...")
+def try_move_motors(ser, targets):
+    """Try to move several motors with one sync write of {motor_id: position}"""
+    print(f"Moving motors to positions {targets}...")
 
-    # Try to disable first (sometime helps reset state)
-    try:
-        result, error = packet_handler.write1ByteTxRx(port_handler, motor_id, 40, 0)  # 40 = Torque Enable
-        if result != scs.COMM_SUCCESS:
-            print(f"  Failed to disable torque: {packet_handler.getTxRxResult(result)}")
-        time.sleep(0.1)
-    except:
-        pass
-
-    # Try to enable
     try:
-        result, error = packet_handler.write1ByteTxRx(port_handler, motor_id, 40, 1)  # 40 = Torque Enable
-        if result == scs.COMM_SUCCESS:
-            print(f"  ✓ Successfully enabled torque on motor {motor_id}")
-            return True
-        else:
-            print(f"  ✗ Failed to enable torque: {packet_handler.getTxRxResult(result)}")
-            return False
+        sync_write_word(ser, list(targets), ADDR_GOAL_POSITION, list(targets.values()))
+        print(f"  ✓ Successfully sent move command to motors {list(targets)}")
+        return True
     except Exception as e:
-        print(f"  ✗ Exception enabling torque: {e}")
+        print(f"  ✗ Exception moving motors: {e}")
         return False
 
-def try_move_motor(motor_id, position):
-    """Try to move a motor to a position"""
-    print(f"Moving motor {motor_id} to position {position}...")
+def read_positions(ser, motor_ids):
+    """Read the positions of several motors with one sync read, falling back to per-motor reads"""
+    print(f"Reading positions of motors {motor_ids}...")
 
-    try:
-        result, error = packet_handler.write2ByteTxRx(port_handler, motor_id, 42, position)  # 42 = Goal Position
-        if result == scs.COMM_SUCCESS:
-            print(f"  ✓ Successfully sent move command to motor {motor_id}")
-            return True
-        else:
-            print(f"  ✗ Failed to send move command: {packet_handler.getTxRxResult(result)}")
-            return False
-    except Exception as e:
-        print(f"  ✗ Exception moving motor: {e}")
-        return False
+    positions = sync_read_word(ser, motor_ids, ADDR_PRESENT_POSITION)
+    if positions:
+        print(f"  ✓ Positions: {positions}")
 
-def read_position(motor_id):
-    """Try to read the position of a motor"""
-    print(f"Reading position of motor {motor_id}...")
+    # Only the motors missing from the sync read pay for an individual round-trip
+    for motor_id in motor_ids:
+        if motor_id not in positions:
+            position, success, _ = read_word(ser, motor_id, ADDR_PRESENT_POSITION)
+            if success:
+                print(f"  ✓ Motor {motor_id} position: {position}")
+                positions[motor_id] = position
+            else:
+                print(f"  ✗ Failed to read position of motor {motor_id}")
 
-    try:
-        position, result, error = packet_handler.read2ByteTxRx(port_handler, motor_id, 56)  # 56 = Present Position
-        if result == scs.COMM_SUCCESS:
-            print(f"  ✓ Position: {position}")
-            return position
-        else:
-            print(f"  ✗ Failed to read position: {packet_handler.getTxRxResult(result)}")
-            return None
-    except Exception as e:
-        print(f"  ✗ Exception reading position: {e}")
-        return None
+    return positions
 
 def main():
     print("=== SO-101 Follower Simple Recovery Tool ===")
 
-    if not open_port():
+    ser = open_port()
+    if not ser:
         print("Failed to open port. Exiting...")
         return
 
     try:
         # Step 1: Ping all motors
         print("\n=== Testing Motor Communication ===")
-        responsive_motors = []
-        for motor_id in MOTOR_IDS:
-            if ping_motor(motor_id):
-                responsive_motors.append(motor_id)
+        responsive_motors = ping_all(ser, MOTOR_IDS)
 
         if not responsive_motors:
             print("\nNo motors responded to ping. Check connections and power.")
@@ -163,48 +96,35 @@ def main():
 
         print(f"\nResponsive motors: {responsive_motors}")
 
-        # Step 2: Try rebooting motors
-        print("\n=== Rebooting Motors ===")
-        for motor_id in responsive_motors:
-            reboot_motor(motor_id)
-
-        # Wait for reboot
-        print("Waiting for motors to reboot...")
-        time.sleep(2)
-
-        # Step 3: Try enabling torque on all responsive motors
+        # Step 2: Try enabling torque on all responsive motors
         print("\n=== Enabling Torque ===")
-        torque_enabled_motors = []
-        for motor_id in responsive_motors:
-            if try_enable_torque(motor_id):
-                torque_enabled_motors.append(motor_id)
+        torque_enabled_motors = try_enable_torque(ser, responsive_motors)
 
         print(f"\nMotors with torque enabled: {torque_enabled_motors}")
 
-        # Step 4: Read positions
+        # Step 3: Read positions
         print("\n=== Reading Positions ===")
-        positions = {}
-        for motor_id in responsive_motors:
-            position = read_position(motor_id)
-            if position is not None:
-                positions[motor_id] = position
+        positions = read_positions(ser, responsive_motors)
 
         print(f"\nCurrent positions: {positions}")
 
-        # Step 5: Try moving motors
+        # Step 4: Try moving motors
         if torque_enabled_motors:
             print("\n=== Testing Movement ===")
+            targets = {}
             for motor_id in torque_enabled_motors:
                 current_pos = positions.get(motor_id)
                 if current_pos is not None:
-                    target_pos = (current_pos + 100) % 4096
+                    targets[motor_id] = (current_pos + 100) % 4096
                 else:
-                    target_pos = 2048  # Center position
-
-                if try_move_motor(motor_id, target_pos):
-                    print("  Waiting for movement...")
-                    time.sleep(1)
-                    new_pos = read_position(motor_id)
+                    targets[motor_id] = CENTER_POSITION
+
+            if try_move_motors(ser, targets):
+                print("  Waiting for movement...")
+                wait_moved(ser, list(targets), timeout=1)
+                new_positions = read_positions(ser, list(targets))
+                for motor_id, target_pos in targets.items():
+                    new_pos = new_positions.get(motor_id)
                     if new_pos is not None:
                         diff = abs(new_pos - target_pos)
                         if diff < 20:
@@ -212,23 +132,21 @@ def main():
                         else:
                             print(f"  ✗ Motor {motor_id} didn't move correctly (Position: {new_pos}, Difference: {diff})")
 
-        # Step 6: Try to center all motors
+        # Step 5: Try to center all motors
         print("\n=== Moving All Motors to Center ===")
-        for motor_id in responsive_motors:
-            try_enable_torque(motor_id)
-            if try_move_motor(motor_id, 2048):  # 2048 = Center position
-                print(f"  Moving motor {motor_id} to center position...")
+        try_enable_torque(ser, responsive_motors)
+        if try_move_motors(ser, {motor_id: CENTER_POSITION for motor_id in responsive_motors}):
+            print(f"  Moving motors {responsive_motors} to center position...")
 
         print("Waiting for movement to complete...")
-        time.sleep(3)
+        wait_moved(ser, responsive_motors, timeout=3)
 
         # Read final positions
         print("\n=== Final Positions ===")
-        for motor_id in responsive_motors:
-            read_position(motor_id)
+        read_positions(ser, responsive_motors)
 
     finally:
-        port_handler.closePort()
+        close_port(ser)
         print("\nPort closed. Recovery attempts complete.")
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""
+SO-101 Follower Motor Daemon
+
+Keeps the follower arm's serial port open between test runs so the move_* scripts don't pay for
+opening the port and configuring the bus every time:
+
+1. Opens the FeetechMotorsBus for the whole arm once
+2. Listens on localhost for RemoteBus clients (see _common.py)
+3. Serves one JSON request per line, e.g. {"op": "read", "data_name": "Present_Position", "motor_names": ["gripper"]}
+
+While the daemon runs, open_arm() in the move_* scripts connects to it automatically.
+
+Usage:
+    python motor_daemon.py
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+
+from _common import DAEMON_ADDRESS, AsyncBus, connect_follower_bus
+
+log = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(asctime)s %(message)s")
+
+async def handle_request(bus, request):
+    """Run one client request on the shared bus and return its JSON-serializable result"""
+    if request["op"] == "read":
+        values = await bus.read(request["data_name"], request["motor_names"])
+        return values.tolist()
+    if request["op"] == "write":
+        await bus.write(request["data_name"], request["values"], request["motor_names"])
+        return None
+    raise ValueError(f"Unknown op {request['op']!r}")
+
+async def handle_client(bus, reader, writer):
+    """Serve requests from one client until it disconnects"""
+    peer = writer.get_extra_info("peername")
+    log.info("Client connected: %s", peer)
+
+    try:
+        while line := await reader.readline():
+            try:
+                reply = {"result": await handle_request(bus, json.loads(line))}
+            except Exception as e:
+                reply = {"error": str(e), "type": type(e).__name__}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        log.info("Client disconnected: %s", peer)
+
+async def main():
+    motors_bus = connect_follower_bus()
+    # Every client shares the bus through one worker thread, so requests never interleave on the wire
+    bus = AsyncBus(motors_bus)
+
+    try:
+        server = await asyncio.start_server(functools.partial(handle_client, bus), *DAEMON_ADDRESS)
+        log.info("Motor daemon listening on %s:%s", *DAEMON_ADDRESS)
+        async with server:
+            await server.serve_forever()
+    finally:
+        bus.close()
+        motors_bus.disconnect()
+        log.info("Disconnected from motors bus")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        log.info("Exiting...")
@@ -1,85 +1,59 @@
-import sys
-import time
-from lerobot.common.robot_devices.motors.feetech import FeetechMotorsBus
-from lerobot.common.robot_devices.motors.configs import FeetechMotorsBusConfig
+import asyncio
+import logging
+import os
 
-def main():
-    print("Starting gripper movement test...")
-    
-    # Define motor configuration for follower arm
-    follower_port = "COM4"  # Port for follower arm
-    
-    # Create motor configuration - only include the gripper
-    motors_config = {
-        "gripper": (6, "sts3215")
-    }
-    
-    config = FeetechMotorsBusConfig(
-        port=follower_port,
-        motors=motors_config
-    )
+from _common import AsyncBus, open_arm
+
+log = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(asctime)s %(message)s")
+
+async def main():
+    log.info("Starting gripper movement test...")
     
     try:
-        # Connect to the motors bus
-        motors_bus = FeetechMotorsBus(config)
-        motors_bus.connect()
-        
-        print(f"Connected to motors bus on {follower_port}")
-        
-        # Read initial gripper position
-        try:
-            initial_position = motors_bus.read("Present_Position", "gripper")[0]
-            print(f"Initial gripper position: {initial_position}")
-        except Exception as e:
-            print(f"Error reading gripper position: {e}")
-            initial_position = 2000  # Default value
-        
-        # Enable torque for gripper
-        print("Enabling torque for gripper...")
-        motors_bus.write("Torque_Enable", 1, "gripper")
-        time.sleep(1)
-        
-        # Open gripper (increase position)
-        print("Opening gripper...")
-        open_position = initial_position + 200
-        motors_bus.write("Goal_Position", open_position, "gripper")
-        time.sleep(2)
-        
-        # Read current position
-        current_position = motors_bus.read("Present_Position", "gripper")[0]
-        print(f"Gripper position after opening: {current_position}")
-        
-        # Close gripper (decrease position)
-        print("Closing gripper...")
-        close_position = initial_position - 200
-        motors_bus.write("Goal_Position", close_position, "gripper")
-        time.sleep(2)
-        
-        # Read current position
-        current_position = motors_bus.read("Present_Position", "gripper")[0]
-        print(f"Gripper position after closing: {current_position}")
-        
-        # Return to initial position
-        print("Returning to initial position...")
-        motors_bus.write("Goal_Position", initial_position, "gripper")
-        time.sleep(2)
-        
-        # Read final position
-        final_position = motors_bus.read("Present_Position", "gripper")[0]
-        print(f"Final gripper position: {final_position}")
-        
-        # Disable torque
-        print("Disabling torque for gripper...")
-        motors_bus.write("Torque_Enable", 0, "gripper")
-        
-        # Disconnect
-        motors_bus.disconnect()
-        print("Disconnected from motors bus")
+        # Connect to the motors bus with only the gripper configured
+        with open_arm(names=("gripper",)) as (motors_bus, initial_positions):
+            bus = AsyncBus(motors_bus)
+            try:
+                initial_position = initial_positions["gripper"]
+                if initial_position is None:
+                    initial_position = 2000  # Default value if the read failed
+            
+                # Open gripper (increase position)
+                log.info("Opening gripper...")
+                open_position = initial_position + 200
+                await bus.write("Goal_Position", open_position, "gripper")
+                await asyncio.sleep(2)
+            
+                # Read current position
+                current_position = (await bus.read("Present_Position", "gripper"))[0]
+                log.info("Gripper position after opening: %s", current_position)
+            
+                # Close gripper (decrease position)
+                log.info("Closing gripper...")
+                close_position = initial_position - 200
+                await bus.write("Goal_Position", close_position, "gripper")
+                await asyncio.sleep(2)
+            
+                # Read current position
+                current_position = (await bus.read("Present_Position", "gripper"))[0]
+                log.info("Gripper position after closing: %s", current_position)
+            
+                # Return to initial position
+                log.info("Returning to initial position...")
+                await bus.write("Goal_Position", initial_position, "gripper")
+                await asyncio.sleep(2)
+            
+                # Read final position
+                final_position = (await bus.read("Present_Position", "gripper"))[0]
+                log.info("Final gripper position: %s", final_position)
+            finally:
+                bus.close()
         
     except Exception as e:
-        print(f"Error: {e}")
+        log.error("Error: %s", e)
     
-    print("Gripper test complete!")
+    log.info("Gripper test complete!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
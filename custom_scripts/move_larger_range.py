@@ -1,178 +1,103 @@
-import sys
-import time
-from lerobot.common.robot_devices.motors.feetech import FeetechMotorsBus
-from lerobot.common.robot_devices.motors.configs import FeetechMotorsBusConfig
+import asyncio
+import logging
+import os
 
-def main():
-    print("===== TESTING LARGER JOINT MOVEMENTS (10% of range) =====")
-    sys.stdout.flush()
+from _common import AsyncBus, open_arm, wait_reached
+
+log = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(asctime)s %(message)s")
+
+async def main():
+    log.info("===== TESTING LARGER JOINT MOVEMENTS (10% of range) =====")
     
     try:
-        print("Step 1: Creating motor configuration...")
-        sys.stdout.flush()
-        
-        # Define motor configuration for follower arm
-        follower_port = "COM4"  # Port for follower arm
-        motors_config = {
-            "shoulder_pan": (1, "sts3215"),
-            "shoulder_lift": (2, "sts3215"),
-            "elbow_flex": (3, "sts3215"),
-            "wrist_flex": (4, "sts3215"),
-            "wrist_roll": (5, "sts3215"),
-            "gripper": (6, "sts3215")
-        }
-        
-        config = FeetechMotorsBusConfig(
-            port=follower_port,
-            motors=motors_config
-        )
-        
-        print("Step 2: Connecting to motors bus...")
-        sys.stdout.flush()
+        log.info("Connecting to motors bus and enabling torque...")
         
-        # Connect to the motors bus
-        motors_bus = FeetechMotorsBus(config)
-        motors_bus.connect()
-        
-        print(f"Connected to motors bus on {follower_port}")
-        sys.stdout.flush()
-        
-        print("Step 3: Reading initial positions for all motors...")
-        sys.stdout.flush()
-        
-        # Read initial positions for all motors
-        initial_positions = {}
-        for motor_name in motors_config.keys():
+        with open_arm() as (motors_bus, initial_positions):
+            # Bus calls are awaited on one worker thread, so the next joint's move can be queued
+            # while the previous joint is still settling
+            bus = AsyncBus(motors_bus)
             try:
-                position = motors_bus.read("Present_Position", motor_name)[0]
-                initial_positions[motor_name] = position
-                print(f"Initial {motor_name} position: {position}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
-                initial_positions[motor_name] = 0
-        
-        print("Step 4: Enabling torque for all motors...")
-        sys.stdout.flush()
-        
-        # Enable torque for all motors
-        for motor_name in motors_config.keys():
-            try:
-                motors_bus.write("Torque_Enable", 1, motor_name)
-                print(f"Torque enabled for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error enabling torque for {motor_name}: {e}")
-                sys.stdout.flush()
-        
-        # Define the range for each joint
-        # 10% of full range of motion (full range would be ~4000 steps for these motors)
-        # Using approximately 400 steps which is about 10% of full range
-        MOVE_AMOUNT = 400
-        WAIT_TIME = 3  # More time to see the movement clearly
-        
-        # Test each motor one by one with larger movements
-        for motor_name in motors_config.keys():
-            print(f"\n===== TESTING {motor_name.upper()} =====")
-            sys.stdout.flush()
+                # Define the range for each joint
+                # 10% of full range of motion (full range would be ~4000 steps for these motors)
+                # Using approximately 400 steps which is about 10% of full range
+                MOVE_AMOUNT = 400
+                WAIT_TIME = 3  # More time to see the movement clearly
             
-            try:
-                # Get initial position
-                initial_pos = initial_positions[motor_name]
-                
-                # Move in positive direction (10% of range)
-                print(f"Moving {motor_name} in positive direction...")
-                sys.stdout.flush()
-                motors_bus.write("Goal_Position", initial_pos + MOVE_AMOUNT, motor_name)
-                print(f"Command sent to move to position {initial_pos + MOVE_AMOUNT}")
-                sys.stdout.flush()
-                
-                print(f"Waiting {WAIT_TIME} seconds...")
-                sys.stdout.flush()
-                time.sleep(WAIT_TIME)
-                
-                # Read current position
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} position after positive move: {current_pos}")
-                print(f"Moved {current_pos - initial_pos} steps from initial position")
-                sys.stdout.flush()
-                
-                # Return to initial position
-                print(f"Returning {motor_name} to initial position...")
-                sys.stdout.flush()
-                motors_bus.write("Goal_Position", initial_pos, motor_name)
-                print(f"Command sent to move to position {initial_pos}")
-                sys.stdout.flush()
-                
-                print(f"Waiting {WAIT_TIME} seconds...")
-                sys.stdout.flush()
-                time.sleep(WAIT_TIME)
-                
-                # Move in negative direction (10% of range)
-                print(f"Moving {motor_name} in negative direction...")
-                sys.stdout.flush()
-                motors_bus.write("Goal_Position", initial_pos - MOVE_AMOUNT, motor_name)
-                print(f"Command sent to move to position {initial_pos - MOVE_AMOUNT}")
-                sys.stdout.flush()
-                
-                print(f"Waiting {WAIT_TIME} seconds...")
-                sys.stdout.flush()
-                time.sleep(WAIT_TIME)
-                
-                # Read current position
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} position after negative move: {current_pos}")
-                print(f"Moved {initial_pos - current_pos} steps from initial position")
-                sys.stdout.flush()
-                
-                # Return to initial position
-                print(f"Returning {motor_name} to initial position...")
-                sys.stdout.flush()
-                motors_bus.write("Goal_Position", initial_pos, motor_name)
-                print(f"Command sent to move to position {initial_pos}")
-                sys.stdout.flush()
-                
-                print(f"Waiting {WAIT_TIME} seconds...")
-                sys.stdout.flush()
-                time.sleep(WAIT_TIME)
-                
-                # Read final position
-                final_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"Final {motor_name} position: {final_pos}")
-                sys.stdout.flush()
+                async def finish_return(motor_name, initial_pos, write_task):
+                    """Wait for a joint queued to return home and report its final position"""
+                    try:
+                        await write_task
+                        await wait_reached(bus, motor_name, initial_pos, timeout=WAIT_TIME)
+                        final_pos = (await bus.read("Present_Position", motor_name))[0]
+                        log.info("Final %s position: %s", motor_name, final_pos)
+                    except Exception as e:
+                        log.error("Error returning %s: %s", motor_name, e)
+            
+                returning = None  # (motor_name, initial_pos, write_task) of the joint still travelling home
+            
+                # Test each motor one by one with larger movements
+                for motor_name, initial_pos in initial_positions.items():
+                    log.info("===== TESTING %s =====", motor_name.upper())
                 
-            except Exception as e:
-                print(f"Error testing {motor_name}: {e}")
-                sys.stdout.flush()
-        
-        print("\nStep 5: Disabling torque for all motors...")
-        sys.stdout.flush()
-        
-        # Disable torque for all motors
-        for motor_name in motors_config.keys():
-            try:
-                motors_bus.write("Torque_Enable", 0, motor_name)
-                print(f"Torque disabled for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error disabling torque for {motor_name}: {e}")
-                sys.stdout.flush()
-        
-        print("Step 6: Disconnecting...")
-        sys.stdout.flush()
-        
-        # Disconnect
-        motors_bus.disconnect()
-        print("Disconnected from motors bus")
-        sys.stdout.flush()
+                    try:
+                        # Move in positive direction (10% of range)
+                        log.info("Moving %s in positive direction...", motor_name)
+                        move = asyncio.create_task(bus.write("Goal_Position", initial_pos + MOVE_AMOUNT, motor_name))
+                        log.info("Command sent to move to position %s", initial_pos + MOVE_AMOUNT)
+                    
+                        if returning is not None:
+                            await finish_return(*returning)
+                            returning = None
+                        await move
+                    
+                        log.info("Waiting up to %s seconds...", WAIT_TIME)
+                        await wait_reached(bus, motor_name, initial_pos + MOVE_AMOUNT, timeout=WAIT_TIME)
+                    
+                        # Read current position
+                        current_pos = (await bus.read("Present_Position", motor_name))[0]
+                        log.info("%s position after positive move: %s", motor_name, current_pos)
+                        log.info("Moved %s steps from initial position", current_pos - initial_pos)
+                    
+                        # Return to initial position
+                        log.info("Returning %s to initial position...", motor_name)
+                        await bus.write("Goal_Position", initial_pos, motor_name)
+                        log.info("Command sent to move to position %s", initial_pos)
+                    
+                        log.info("Waiting up to %s seconds...", WAIT_TIME)
+                        await wait_reached(bus, motor_name, initial_pos, timeout=WAIT_TIME)
+                    
+                        # Move in negative direction (10% of range)
+                        log.info("Moving %s in negative direction...", motor_name)
+                        await bus.write("Goal_Position", initial_pos - MOVE_AMOUNT, motor_name)
+                        log.info("Command sent to move to position %s", initial_pos - MOVE_AMOUNT)
+                    
+                        log.info("Waiting up to %s seconds...", WAIT_TIME)
+                        await wait_reached(bus, motor_name, initial_pos - MOVE_AMOUNT, timeout=WAIT_TIME)
+                    
+                        # Read current position
+                        current_pos = (await bus.read("Present_Position", motor_name))[0]
+                        log.info("%s position after negative move: %s", motor_name, current_pos)
+                        log.info("Moved %s steps from initial position", initial_pos - current_pos)
+                    
+                        # Return to initial position without waiting: the return settles while
+                        # the next joint starts its positive move
+                        log.info("Returning %s to initial position...", motor_name)
+                        returning = (motor_name, initial_pos, asyncio.create_task(bus.write("Goal_Position", initial_pos, motor_name)))
+                        log.info("Command sent to move to position %s", initial_pos)
+                    
+                    except Exception as e:
+                        log.error("Error testing %s: %s", motor_name, e)
+            
+                if returning is not None:
+                    await finish_return(*returning)
+            finally:
+                bus.close()
         
     except Exception as e:
-        print(f"ERROR: {e}")
-        sys.stdout.flush()
+        log.error("Error: %s", e)
     
-    print("===== LARGER JOINT MOVEMENTS TEST COMPLETE =====")
-    sys.stdout.flush()
+    log.info("===== LARGER JOINT MOVEMENTS TEST COMPLETE =====")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -138,7 +138,9 @@ def main():
                         print(f"WARNING: {motor_name} is under high load ({current_load}). Movement may be unsafe.")
                         return False
                 except Exception:
-                    pass  # If read fails, continue with other checks                return True
+                    pass  # If read fails, continue with other checks
+
+                return True
             except Exception as e:
                 print(f"Error checking limits for {motor_name}: {e}")
                 return False
@@ -217,7 +219,9 @@ def main():
                 sys.stdout.flush()
             except Exception as e:
                 print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()        print("\n===== MOVING ALL MOTORS BACKWARD BY 10% =====")
+                sys.stdout.flush()
+
+        print("\n===== MOVING ALL MOTORS BACKWARD BY 10% =====")
         sys.stdout.flush()
         
         # Play warning sound and message before backward movement
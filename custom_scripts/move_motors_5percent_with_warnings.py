@@ -1,398 +1,452 @@
+import logging
+import queue
 import sys
+import threading
 import time
 import winsound
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+
 import pyttsx3
+
+import numpy as np
+
 from lerobot.common.robot_devices.motors.feetech import FeetechMotorsBus, JointOutOfRangeError
 from lerobot.common.robot_devices.motors.configs import FeetechMotorsBusConfig
 
-def play_warning(message):
-    """Play a warning sound and speak a message"""
+class _RawQueueHandler(QueueHandler):
+    """QueueHandler that queues the record as is, leaving its formatting to the listener's handler"""
+
+    def prepare(self, record):
+        # The queue never leaves this process, so the record needn't be made picklable first
+        return record
+
+# Log records are only queued on the calling thread; formatting and writing them to stdout happens
+# on the listener's thread, so a burst of load warnings can't delay an emergency stop
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(_RawQueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+
+# Follower arm motors in motor ID order (IDs 1-6); every batched read and write uses this order
+MOTOR_NAMES = ("shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper")
+
+_tts_engine = None
+
+def _init_tts():
+    """Initialize the TTS engine once, on the thread that will use it
+
+    An exception here would break the pool and fail every later warning, so without a working
+    engine _tts_engine stays None and warnings only beep.
+    """
+    global _tts_engine
+    try:
+        engine = pyttsx3.init()
+
+        # Set properties (optional)
+        engine.setProperty('rate', 150)    # Speed of speech
+        engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+    except Exception as e:
+        log.error("Error initializing text-to-speech, warnings will only beep: %s", e)
+        return
+    _tts_engine = engine
+
+# Warnings play on a background thread so the arm setup and safety reads carry on while they speak.
+# A single worker keeps warnings from talking over each other.
+_tts_pool = ThreadPoolExecutor(max_workers=1, initializer=_init_tts)
+
+def _speak_impl(message):
     # Play warning beep
     winsound.Beep(1000, 500)  # 1000 Hz for 500 milliseconds
 
-    # Initialize the TTS engine
-    engine = pyttsx3.init()
+    # Speak the warning message
+    if _tts_engine is None:
+        return
+    _tts_engine.say(message)
+    _tts_engine.runAndWait()
+
+def play_warning(message):
+    """Play a warning sound and speak a message in the background, returning a Future for when it is done"""
+    log.info("TTS WARNING: %s", message)
+    return _tts_pool.submit(_speak_impl, message)
 
-    # Set properties (optional)
-    engine.setProperty('rate', 150)    # Speed of speech
-    engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+class MotorBusWorker(threading.Thread):
+    """Thread that owns the FeetechMotorsBus and services read/write requests in order.
 
-    # Speak the warning message
-    print(f"TTS WARNING: {message}")
-    sys.stdout.flush()
-    engine.say(message)
-    engine.runAndWait()
+    The main thread keeps announcing warnings and printing progress while the worker waits on the
+    bus, and every request gets a Future resolving to the values read (None for writes).
+    """
+
+    def __init__(self, motors_bus):
+        super().__init__(daemon=True)
+        self.motors_bus = motors_bus
+        self.requests = queue.Queue()
+
+    @property
+    def is_connected(self):
+        return self.motors_bus.is_connected
 
-    # Play another beep after speech
-    winsound.Beep(1000, 300)
-    time.sleep(1)  # Brief pause after warning
+    def _submit(self, op, data_name, motor_names, values=None):
+        future = Future()
+        self.requests.put((op, data_name, motor_names, values, future))
+        return future
+
+    def submit_read(self, data_name, motor_names=None):
+        return self._submit("read", data_name, motor_names)
+
+    def submit_write(self, data_name, values, motor_names=None):
+        return self._submit("write", data_name, motor_names, values)
+
+    def read(self, data_name, motor_names=None):
+        return self.submit_read(data_name, motor_names).result()
+
+    def write(self, data_name, values, motor_names=None):
+        return self.submit_write(data_name, values, motor_names).result()
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            op, data_name, motor_names, values, future = request
+            try:
+                if op == "read":
+                    future.set_result(self.motors_bus.read(data_name, motor_names))
+                else:
+                    future.set_result(self.motors_bus.write(data_name, values, motor_names))
+            except Exception as e:
+                future.set_exception(e)
+
+    def disconnect(self):
+        """Finish the queued requests, stop the worker thread and disconnect the bus"""
+        self.requests.put(None)
+        self.join()
+        self.motors_bus.disconnect()
+
+class SafeBus:
+    """Context manager that connects a FeetechMotorsBus behind a MotorBusWorker and, however the block
+    exits, disables torque on every motor with one sync write and disconnects."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def __enter__(self):
+        feetech_bus = FeetechMotorsBus(self.config)
+        feetech_bus.connect()
+        self.motors_bus = MotorBusWorker(feetech_bus)
+        self.motors_bus.start()
+        return self.motors_bus
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            play_warning("Emergency shutdown in progress due to an error.")
+        try:
+            self.motors_bus.write("Torque_Enable", 0)
+            log.info("Torque disabled for all motors")
+        except Exception as e:
+            log.error("Error disabling torque: %s", e)
+        finally:
+            self.motors_bus.disconnect()
+            log.info("\nDisconnected from motors bus")
+
+POLL_INTERVAL = 0.05  # Check the motors at 20 Hz while they move
+START_GRACE = 0.25  # Motors may still report idle this long after a goal write, before they start
+
+def check_joint_limits_vec(current, target, load):
+    """Return a bool mask of the motors whose move from current to target passes the safety limits
+
+    Each argument holds one value per motor, so all motors are checked with a few array comparisons.
+    """
+    # If movement is too large (more than 25% of range = ~1024 steps), it might be dangerous
+    change = np.abs(current - target)
+
+    # STS3215 has a range of 0-4095 (absolute physical limits), and a high load (> 200)
+    # indicates resistance that makes any movement unsafe
+    return (change <= 1024) & (target >= 0) & (target <= 4095) & (load <= 200)
+
+def wait_until_stopped(motors_bus, motor_names, timeout):
+    """Monitor the motors until they have all stopped or timeout expires
+
+    Returns False right away if any motor is under extreme load, after stopping the overloaded motors
+    with one sync write (or disabling torque on every motor if more than one is overloaded).
+    """
+    # Deadlines on the monotonic clock are computed once, so wall-clock adjustments can't stretch or cut the wait
+    now = time.monotonic()
+    deadline = now + timeout
+    grace_end = now + START_GRACE
+    seen_moving = False
+    while (now := time.monotonic()) < deadline:
+        # Check if all motors have completed their movements, reading each register for
+        # all motors with one sync read
+        try:
+            moving = motors_bus.read("Moving", motor_names)
+            current_positions = motors_bus.read("Present_Position", motor_names)
+            all_stopped = not moving.any()
+        except Exception as e:
+            log.error("Error checking motor status: %s", e)
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        # Also check current load as a safety measure
+        try:
+            current_loads = motors_bus.read("Present_Load", motor_names)
+        except Exception:
+            current_loads = np.zeros(len(motor_names))
+
+        overloaded = current_loads > 250  # Extremely high load
+        if overloaded.any():
+            overloaded_names = [motor_name for motor_name, over in zip(motor_names, overloaded) if over]
+            for motor_name, current_load in zip(overloaded_names, current_loads[overloaded]):
+                log.warning("WARNING: %s experiencing high load (%s)! Emergency stop.", motor_name, current_load)
+            if len(overloaded_names) > 1:
+                # Several joints straining at once means the arm has likely hit something, so cut torque everywhere
+                motors_bus.write("Torque_Enable", 0)
+            else:
+                # Stop the overloaded motor at its current position
+                motors_bus.write("Goal_Position", current_positions[overloaded], overloaded_names)
+            return False
+
+        for motor_name, current_load in zip(motor_names, current_loads):
+            if current_load > 150:  # Moderately high load
+                log.warning("Caution: %s under elevated load: %s", motor_name, current_load)
+
+        # If all motors have stopped moving, we can break early. An idle reading right after the
+        # goal write only counts once the motors have had START_GRACE to begin moving.
+        seen_moving = seen_moving or not all_stopped
+        if all_stopped and (seen_moving or now > grace_end):
+            log.info("All motors have completed their movements")
+            return True
+
+        time.sleep(POLL_INTERVAL)
+
+    return False
 
 def main():
-    print("===== MOVING ALL MOTORS BY 5% RANGE OF MOTION WITH SAFETY CONTROLS =====")
-    sys.stdout.flush()
+    # Line-buffered stdout shows each message as soon as it is written without flushing by hand
+    sys.stdout.reconfigure(line_buffering=True)
+    _log_listener.start()
+
+    log.info("===== MOVING ALL MOTORS BY 5% RANGE OF MOTION WITH SAFETY CONTROLS =====")
 
     try:
         # Initial warning about the script
         play_warning("Warning! Robot arm is initializing. Please keep a safe distance.")
-        time.sleep(1)
-        print("Step 1: Creating motor configuration...")
-        sys.stdout.flush()
+        log.info("Step 1: Creating motor configuration...")
 
         # Define motor configuration for follower arm
         follower_port = "COM4"  # Port for follower arm
-        motors_config = {
-            "shoulder_pan": (1, "sts3215"),
-            "shoulder_lift": (2, "sts3215"),
-            "elbow_flex": (3, "sts3215"),
-            "wrist_flex": (4, "sts3215"),
-            "wrist_roll": (5, "sts3215"),
-            "gripper": (6, "sts3215")
-        }
+        motors_config = {motor_name: (motor_id, "sts3215") for motor_id, motor_name in enumerate(MOTOR_NAMES, start=1)}
 
         config = FeetechMotorsBusConfig(
             port=follower_port,
             motors=motors_config
         )
 
-        print("Step 2: Connecting to motors bus...")
-        sys.stdout.flush()
+        log.info("Step 2: Connecting to motors bus...")
 
-        # Connect to the motors bus
-        motors_bus = FeetechMotorsBus(config)
-        motors_bus.connect()
+        # Connect to the motors bus behind a worker thread that performs all bus I/O. Leaving the block,
+        # normally or on an error, disables torque on every motor and disconnects.
+        with SafeBus(config) as motors_bus:
+            log.info("Connected to motors bus on %s", follower_port)
 
-        print(f"Connected to motors bus on {follower_port}")
-        sys.stdout.flush()
+            log.info("Step 3: Reading initial positions for all motors...")
 
-        print("Step 3: Reading initial positions for all motors...")
-        sys.stdout.flush()
+            # Read initial positions for all motors, queueing every read before waiting on the first
+            position_reads = {motor_name: motors_bus.submit_read("Present_Position", motor_name) for motor_name in MOTOR_NAMES}
+            initial_positions = {}
+            for motor_name, position_read in position_reads.items():
+                try:
+                    position = position_read.result()[0]
+                    initial_positions[motor_name] = position
+                    log.info("Initial %s position: %s", motor_name, position)
+                except Exception as e:
+                    log.error("Error reading %s position: %s", motor_name, e)
+                    initial_positions[motor_name] = 0
 
-        # Read initial positions for all motors
-        initial_positions = {}
-        for motor_name in motors_config.keys():
-            try:
-                position = motors_bus.read("Present_Position", motor_name)[0]
-                initial_positions[motor_name] = position
-                print(f"Initial {motor_name} position: {position}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
-                initial_positions[motor_name] = 0
+            # The initial positions never change, so the return-to-initial goals are fixed from here on
+            return_targets = np.array([initial_positions[motor_name] for motor_name in MOTOR_NAMES])
 
-        print("Step 4: Setting safety parameters and enabling torque...")
-        sys.stdout.flush()
+            log.info("Step 4: Setting safety parameters and enabling torque...")
 
-        # Set safety parameters and enable torque for all motors
-        for motor_name in motors_config.keys():
+            # Configure all motors in one pass, one sync write per register: torque off, the safety
+            # parameters, then torque back on
             try:
+                # Disable torque so the parameters are applied to idle motors
+                motors_bus.write("Torque_Enable", 0)
+
                 # Set Low Speed (Goal_Speed is used for speed control)
                 # For STS3215, speed can be set from 0 (slowest) to 1023 (fastest)
-                motors_bus.write("Lock", 0, motor_name)  # Unlock to allow parameter changes
+                motors_bus.write("Lock", 0)  # Unlock to allow parameter changes
 
                 # Set acceleration to a lower value (normal is 254)
                 # Lower acceleration means smoother start/stop
-                motors_bus.write("Acceleration", 50, motor_name)
+                motors_bus.write("Acceleration", 50)
 
                 # Set a low speed value
-                motors_bus.write("Goal_Speed", 100, motor_name)  # Lower value = slower movement
+                motors_bus.write("Goal_Speed", 100)  # Lower value = slower movement
 
                 # Now enable torque
-                motors_bus.write("Torque_Enable", 1, motor_name)
+                motors_bus.write("Torque_Enable", 1)
 
-                print(f"Safety parameters set and torque enabled for {motor_name}")
-                sys.stdout.flush()
+                log.info("Safety parameters set and torque enabled for all motors")
             except Exception as e:
-                print(f"Error setting parameters for {motor_name}: {e}")
-                sys.stdout.flush()
+                log.error("Error setting motor parameters: %s", e)
 
-        # Motor range is approximately ±180 degrees = 360 degrees total
-        # 5% of range is 18 degrees or about 204.8 steps (with 4096 steps for 360 degrees)
-        MOVE_AMOUNT = 205  # 5% of range (approximately 18 degrees)
-        WAIT_TIME = 5  # Longer wait time for slower movements
+            # Motor range is approximately ±180 degrees = 360 degrees total
+            # 5% of range is 18 degrees or about 204.8 steps (with 4096 steps for 360 degrees)
+            MOVE_AMOUNT = 205  # 5% of range (approximately 18 degrees)
+            WAIT_TIME = 5  # Longer wait time for slower movements
 
-        # Function to check for joint limits
-        def check_joint_limits(motor_name, target_position):
-            # Read current position to have a reference point
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                # Calculate absolute change
-                change = abs(current_pos - target_position)
-
-                # If movement is too large (more than 25% of range = ~1024 steps), it might be dangerous
-                if change > 1024:
-                    print(f"WARNING: Movement for {motor_name} exceeds safe limits! Requested change: {change} steps")
-                    return False
-
-                # Check if the position is within the motor's expected range
-                # STS3215 has a range of 0-4095 (absolute physical limits)
-                if target_position < 0 or target_position > 4095:
-                    print(f"WARNING: Target position {target_position} for {motor_name} is outside motor range (0-4095)")
-                    return False
-
-                # Additional check for load or current if approaching limits
-                # We can read Present_Load as an indicator of strain on the motor
+            # Read the registers the safety checks need with one sync read per register for all motors
+            def read_safety_snapshot():
+                position_read = motors_bus.submit_read("Present_Position", MOTOR_NAMES)
+                load_read = motors_bus.submit_read("Present_Load", MOTOR_NAMES)
                 try:
-                    current_load = motors_bus.read("Present_Load", motor_name)[0]
-                    if current_load > 200:  # High load indicates resistance
-                        print(f"WARNING: {motor_name} is under high load ({current_load}). Movement may be unsafe.")
-                        return False
+                    positions = position_read.result()
+                except Exception as e:
+                    log.error("Error reading motor positions: %s", e)
+                    positions = np.full(len(MOTOR_NAMES), np.nan)  # NaN fails every limit check
+                try:
+                    # Present_Load is an indicator of strain on the motor
+                    loads = load_read.result()
                 except Exception:
-                    pass  # If read fails, continue with other checks
+                    loads = np.zeros(len(MOTOR_NAMES))  # If read fails, continue with other checks
+                return positions, loads
+
+            # Log why a motor failed its safety check; only runs for the motors the mask rejected
+            def log_unsafe(motor_name, target_position, current_pos, current_load):
+                if not 0 <= target_position <= 4095:
+                    log.warning("WARNING: Target position %s for %s is outside motor range (0-4095)", target_position, motor_name)
+                elif current_load > 200:
+                    log.warning("WARNING: %s is under high load (%s). Movement may be unsafe.", motor_name, current_load)
+                else:
+                    log.warning("WARNING: Movement for %s exceeds safe limits! Requested change: %s steps", motor_name, abs(current_pos - target_position))
+
+            # Send the goal positions of every motor that passed its safety check in one sync write,
+            # so all joints are commanded on the same bus tick
+            def write_goal_positions(targets, safe):
+                if not safe.any():
+                    return
+                safe_names = [motor_name for motor_name, ok in zip(MOTOR_NAMES, safe) if ok]
+                try:
+                    motors_bus.write("Goal_Position", targets[safe], safe_names)
+                except JointOutOfRangeError as e:
+                    log.warning("SAFETY ALERT: %s", e)
+                    log.info("Skipping movement for %s", ', '.join(safe_names))
 
-                return True
-            except Exception as e:
-                print(f"Error checking limits for {motor_name}: {e}")
-                return False
+            # Read every motor's position with one sync read and log it
+            def log_positions(label):
+                try:
+                    for motor_name, current_pos in zip(MOTOR_NAMES, motors_bus.read("Present_Position", MOTOR_NAMES)):
+                        log.info("%s %s position: %s", motor_name, label, current_pos)
+                except Exception as e:
+                    log.error("Error reading motor positions: %s", e)
 
-        print("\n===== MOVING ALL MOTORS FORWARD BY 5% =====")
-        sys.stdout.flush()
+            log.info("\n===== MOVING ALL MOTORS FORWARD BY 5% =====")
 
-        # Play warning sound and message before movement
-        play_warning("Robot arm will now move forward by 5 percent of its range. Please keep clear.")
+            # Play warning sound and message before movement
+            warning = play_warning("Robot arm will now move forward by 5 percent of its range. Please keep clear.")
 
-        # First, move all motors forward by 5%
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
-            new_pos = initial_pos + MOVE_AMOUNT
+            # First, move all motors forward by 5%
+            positions, loads = read_safety_snapshot()
+            targets = return_targets + MOVE_AMOUNT
 
             # Safety check before moving
-            if check_joint_limits(motor_name, new_pos):
-                print(f"Moving {motor_name} forward to position {new_pos} (from {initial_pos})...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", new_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Skipping movement for {motor_name}")
-                    sys.stdout.flush()
-            else:
-                print(f"Skipping movement for {motor_name} due to safety limits")
-                sys.stdout.flush()
-
-        # Wait for all motors to reach their positions with monitoring
-        print(f"Waiting {WAIT_TIME} seconds for all motors to reach forward positions...")
-        sys.stdout.flush()
-
-        # Monitor movement with periodic checks
-        start_time = time.time()
-        while time.time() - start_time < WAIT_TIME:
-            # Check every second
-            time.sleep(1)
-
-            # Check if all motors have completed their movements
-            all_stopped = True
-            for motor_name in motors_config.keys():
-                try:
-                    # Check if motor is still moving
-                    moving = motors_bus.read("Moving", motor_name)[0]
-                    current_pos = motors_bus.read("Present_Position", motor_name)[0]
-
-                    # Also check current load as a safety measure
-                    try:
-                        current_load = motors_bus.read("Present_Load", motor_name)[0]
-                        if current_load > 250:  # Extremely high load
-                            print(f"WARNING: {motor_name} experiencing high load ({current_load})! Emergency stop.")
-                            motors_bus.write("Goal_Position", current_pos, motor_name)  # Stop at current position
-                        elif current_load > 150:  # Moderately high load
-                            print(f"Caution: {motor_name} under elevated load: {current_load}")
-                    except Exception:
-                        pass
-
-                    if moving != 0:
-                        all_stopped = False
+            safe = check_joint_limits_vec(positions, targets, loads)
+            for motor_name, new_pos, current_pos, current_load, ok in zip(MOTOR_NAMES, targets, positions, loads, safe):
+                if ok:
+                    log.info("Moving %s forward to position %s (from %s)...", motor_name, new_pos, initial_positions[motor_name])
+                else:
+                    log_unsafe(motor_name, new_pos, current_pos, current_load)
+                    log.info("Skipping movement for %s due to safety limits", motor_name)
 
-                except Exception as e:
-                    print(f"Error checking motor {motor_name} status: {e}")
-                    all_stopped = False
+            # The arm only moves once the spoken warning has finished
+            warning.result()
+            write_goal_positions(targets, safe)
 
-            # If all motors have stopped moving, we can break early
-            if all_stopped and (time.time() - start_time) > 2:  # Ensure at least 2 seconds have passed
-                print("All motors have completed their movements")
-                break
+            # Wait for all motors to reach their positions with monitoring
+            log.info("Waiting %s seconds for all motors to reach forward positions...", WAIT_TIME)
 
-        # Read and display current positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} current position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
+            # Monitor movement with periodic checks
+            wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
+
+            # Read and display current positions
+            log_positions("current")
 
-        print("\n===== MOVING ALL MOTORS BACKWARD BY 10% =====")
-        sys.stdout.flush()
+            log.info("\n===== MOVING ALL MOTORS BACKWARD BY 10% =====")
 
-        # Play warning sound and message before backward movement
-        play_warning("Robot arm will now move backward by 10 percent of its range. Please keep clear.")
+            # Play warning sound and message before backward movement
+            warning = play_warning("Robot arm will now move backward by 10 percent of its range. Please keep clear.")
 
-        # Now move all motors backward by 10% (from +5% to -5%)
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
-            new_pos = initial_pos - MOVE_AMOUNT
+            # Now move all motors backward by 10% (from +5% to -5%)
+            positions, loads = read_safety_snapshot()
+            targets = return_targets - MOVE_AMOUNT
 
             # Safety check before moving
-            if check_joint_limits(motor_name, new_pos):
-                print(f"Moving {motor_name} backward to position {new_pos} (from {motors_bus.read('Present_Position', motor_name)[0]})...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", new_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Skipping movement for {motor_name}")
-                    sys.stdout.flush()
-            else:
-                print(f"Skipping movement for {motor_name} due to safety limits")
-                sys.stdout.flush()
-
-        # Wait for all motors to reach their positions
-        print(f"Waiting {WAIT_TIME} seconds for all motors to reach backward positions...")
-        sys.stdout.flush()
-
-        # Monitor movement with periodic checks
-        start_time = time.time()
-        while time.time() - start_time < WAIT_TIME:
-            # Check every second
-            time.sleep(1)
-
-            # Check if all motors have completed their movements
-            all_stopped = True
-            for motor_name in motors_config.keys():
-                try:
-                    # Check if motor is still moving
-                    moving = motors_bus.read("Moving", motor_name)[0]
-                    current_pos = motors_bus.read("Present_Position", motor_name)[0]
-
-                    # Also check current load as a safety measure
-                    try:
-                        current_load = motors_bus.read("Present_Load", motor_name)[0]
-                        if current_load > 250:  # Extremely high load
-                            print(f"WARNING: {motor_name} experiencing high load ({current_load})! Emergency stop.")
-                            motors_bus.write("Goal_Position", current_pos, motor_name)  # Stop at current position
-                        elif current_load > 150:  # Moderately high load
-                            print(f"Caution: {motor_name} under elevated load: {current_load}")
-                    except Exception:
-                        pass
-
-                    if moving != 0:
-                        all_stopped = False
+            safe = check_joint_limits_vec(positions, targets, loads)
+            for motor_name, new_pos, current_pos, current_load, ok in zip(MOTOR_NAMES, targets, positions, loads, safe):
+                if ok:
+                    log.info("Moving %s backward to position %s (from %s)...", motor_name, new_pos, current_pos)
+                else:
+                    log_unsafe(motor_name, new_pos, current_pos, current_load)
+                    log.info("Skipping movement for %s due to safety limits", motor_name)
 
-                except Exception as e:
-                    print(f"Error checking motor {motor_name} status: {e}")
-                    all_stopped = False
+            # The arm only moves once the spoken warning has finished
+            warning.result()
+            write_goal_positions(targets, safe)
 
-            # If all motors have stopped moving, we can break early
-            if all_stopped and (time.time() - start_time) > 2:  # Ensure at least 2 seconds have passed
-                print("All motors have completed their movements")
-                break
+            # Wait for all motors to reach their positions
+            log.info("Waiting %s seconds for all motors to reach backward positions...", WAIT_TIME)
 
-        # Read and display current positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} current position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
+            # Monitor movement with periodic checks
+            wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
 
-        print("\n===== RETURNING ALL MOTORS TO INITIAL POSITIONS =====")
-        sys.stdout.flush()
+            # Read and display current positions
+            log_positions("current")
 
-        # Play warning sound and message before returning to initial positions
-        play_warning("Robot arm will now return to its initial position. Please keep clear.")
+            log.info("\n===== RETURNING ALL MOTORS TO INITIAL POSITIONS =====")
 
-        # Finally, return all motors to their initial positions
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
+            # Play warning sound and message before returning to initial positions
+            warning = play_warning("Robot arm will now return to its initial position. Please keep clear.")
 
-            # Safety check before moving back to initial position
-            if check_joint_limits(motor_name, initial_pos):
-                print(f"Returning {motor_name} to initial position {initial_pos}...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", initial_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Failed to return {motor_name} to initial position")
-                    sys.stdout.flush()
-            else:
-                print(f"WARNING: Cannot safely return {motor_name} to initial position")
-                sys.stdout.flush()
-
-        # Wait for all motors to reach their initial positions
-        print(f"Waiting {WAIT_TIME} seconds for all motors to return to initial positions...")
-        sys.stdout.flush()
-
-        # Monitor movement with periodic checks
-        start_time = time.time()
-        while time.time() - start_time < WAIT_TIME:
-            # Check every second
-            time.sleep(1)
-
-            # Check if all motors have completed their movements
-            all_stopped = True
-            for motor_name in motors_config.keys():
-                try:
-                    # Check if motor is still moving
-                    moving = motors_bus.read("Moving", motor_name)[0]
-                    if moving != 0:
-                        all_stopped = False
+            # Finally, return all motors to their initial positions
+            positions, loads = read_safety_snapshot()
 
-                except Exception as e:
-                    print(f"Error checking motor {motor_name} status: {e}")
-                    all_stopped = False
+            # Safety check before moving back to initial position
+            safe = check_joint_limits_vec(positions, return_targets, loads)
+            for motor_name, initial_pos, current_pos, current_load, ok in zip(MOTOR_NAMES, return_targets, positions, loads, safe):
+                if ok:
+                    log.info("Returning %s to initial position %s...", motor_name, initial_pos)
+                else:
+                    log_unsafe(motor_name, initial_pos, current_pos, current_load)
+                    log.warning("WARNING: Cannot safely return %s to initial position", motor_name)
 
-            # If all motors have stopped moving, we can break early
-            if all_stopped and (time.time() - start_time) > 2:  # Ensure at least 2 seconds have passed
-                print("All motors have completed their movements")
-                break
+            # The arm only moves once the spoken warning has finished
+            warning.result()
+            write_goal_positions(return_targets, safe)
 
-        # Read and display final positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} final position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
+            # Wait for all motors to reach their initial positions
+            log.info("Waiting %s seconds for all motors to return to initial positions...", WAIT_TIME)
 
-        # Play completion warning
-        play_warning("Movement sequence complete. Robot arm is now disabling torque.")
+            # Monitor movement with periodic checks
+            wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
 
-        print("\nStep 5: Disabling torque for all motors...")
-        sys.stdout.flush()
+            # Read and display final positions
+            log_positions("final")
 
-        # Disable torque for all motors
-        for motor_name in motors_config.keys():
-            try:
-                motors_bus.write("Torque_Enable", 0, motor_name)
-                print(f"Torque disabled for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error disabling torque for {motor_name}: {e}")
-                sys.stdout.flush()
+            # Play completion warning
+            play_warning("Movement sequence complete. Robot arm is now disabling torque.")
 
-        # Disconnect from the motors bus
-        motors_bus.disconnect()
-        print("\nDisconnected from motors bus")
-        sys.stdout.flush()
+            log.info("\nStep 5: Disabling torque for all motors...")
 
     except Exception as e:
-        print(f"Error: {e}")
-        sys.stdout.flush()
-        # Make sure to disable torque in case of error
-        try:
-            if 'motors_bus' in locals() and motors_bus.is_connected:
-                play_warning("Emergency shutdown in progress due to an error.")
-                for motor_name in motors_config.keys():
-                    motors_bus.write("Torque_Enable", 0, motor_name)
-                motors_bus.disconnect()
-                print("Emergency shutdown: Torque disabled and disconnected")
-        except Exception:
-            pass
+        log.error("Error: %s", e)
+
+    # Let any warning still being spoken finish before exiting
+    _tts_pool.shutdown()
+    _log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -1,27 +1,124 @@
+import collections
 import sys
+import threading
 import time
 import numpy as np
 from lerobot.common.robot_devices.motors.feetech import FeetechMotorsBus, JointOutOfRangeError
 from lerobot.common.robot_devices.motors.configs import FeetechMotorsBusConfig
 
+from scs_protocol import set_low_latency
+
+# The poller starts fast, while a move has most likely just begun, and backs off towards
+# MAX_POLL_INTERVAL so a long move doesn't keep the bus saturated
+MIN_POLL_INTERVAL = 0.02
+MAX_POLL_INTERVAL = 0.2
+CHECK_INTERVAL = 0.02  # How often the monitoring loop looks for a new snapshot; costs no bus traffic
+START_GRACE = 0.25  # Motors may still report idle this long after a goal write, before they start
+
+# Follower arm motors in motor ID order (IDs 1-6); every batched read and write uses this order
+MOTOR_NAMES = ("shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper")
+
+class BusPoller(threading.Thread):
+    """Thread that keeps sync-reading Moving, Present_Position and Present_Load while the motors move
+
+    Only the latest snapshot is kept, so the monitoring loop runs its safety checks on fresh values
+    without waiting on the serial port itself. bus_lock keeps the poller's reads from interleaving
+    with the monitoring loop's emergency-stop writes.
+    """
+
+    def __init__(self, motors_bus, motor_names, bus_lock):
+        super().__init__(daemon=True)
+        self.motors_bus = motors_bus
+        self.motor_names = motor_names
+        self.bus_lock = bus_lock
+        # Each entry is (moving, positions, loads), with loads None if their read failed, or the
+        # exception that stopped the status read
+        self.snapshots = collections.deque(maxlen=1)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        interval = MIN_POLL_INTERVAL
+        while not self.stop_event.is_set():
+            with self.bus_lock:
+                try:
+                    moving = self.motors_bus.read("Moving", self.motor_names)
+                    positions = self.motors_bus.read("Present_Position", self.motor_names)
+                except Exception as e:
+                    self.snapshots.append(e)
+                else:
+                    try:
+                        loads = self.motors_bus.read("Present_Load", self.motor_names)
+                    except Exception:
+                        loads = None
+                    self.snapshots.append((moving, positions, loads))
+            self.stop_event.wait(interval)
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+def wait_until_stopped(motors_bus, motor_names, timeout):
+    """Monitor the motors until they have all stopped or timeout expires, stopping any motor under extreme load
+
+    A poller thread keeps sync-reading the motors' status in the background, so each check works
+    on the latest snapshot instead of waiting on the serial port.
+    """
+    bus_lock = threading.Lock()
+    poller = BusPoller(motors_bus, motor_names, bus_lock)
+    poller.start()
+    start_time = time.time()
+    seen_moving = False
+    try:
+        while time.time() - start_time < timeout:
+            time.sleep(CHECK_INTERVAL)
+            
+            # Take the newest snapshot; none means the poller hasn't finished one since the last check
+            try:
+                snapshot = poller.snapshots.pop()
+            except IndexError:
+                continue
+            if isinstance(snapshot, Exception):
+                print(f"Error checking motor status: {snapshot}")
+                continue
+            
+            # Check if all motors have completed their movements
+            moving, current_positions, current_loads = snapshot
+            all_stopped = not moving.any()
+            
+            # Also check current load as a safety measure
+            if current_loads is not None:
+                for motor_name, current_pos, current_load in zip(motor_names, current_positions, current_loads):
+                    if current_load > 250:  # Extremely high load
+                        print(f"WARNING: {motor_name} experiencing high load ({current_load})! Emergency stop.")
+                        with bus_lock:
+                            motors_bus.write("Goal_Position", current_pos, motor_name)  # Stop at current position
+                    elif current_load > 150:  # Moderately high load
+                        print(f"Caution: {motor_name} under elevated load: {current_load}")
+            
+            # If all motors have stopped moving, we can stop waiting. An idle reading right after the
+            # goal write only counts once the motors have had START_GRACE to begin moving.
+            seen_moving = seen_moving or not all_stopped
+            if all_stopped and (seen_moving or time.time() - start_time > START_GRACE):
+                print("All motors have completed their movements")
+                return True
+    finally:
+        poller.stop()
+    
+    return False
+
 def main():
+    # Line-buffered stdout shows each message as soon as it is printed without flushing by hand
+    sys.stdout.reconfigure(line_buffering=True)
+
     print("===== MOVING ALL MOTORS BY 2% RANGE OF MOTION WITH SAFETY CONTROLS =====")
-    sys.stdout.flush()
     
     try:
         print("Step 1: Creating motor configuration...")
-        sys.stdout.flush()
         
         # Define motor configuration for follower arm
         follower_port = "COM4"  # Port for follower arm
-        motors_config = {
-            "shoulder_pan": (1, "sts3215"),
-            "shoulder_lift": (2, "sts3215"),
-            "elbow_flex": (3, "sts3215"),
-            "wrist_flex": (4, "sts3215"),
-            "wrist_roll": (5, "sts3215"),
-            "gripper": (6, "sts3215")
-        }
+        motors_config = {motor_name: (motor_id, "sts3215") for motor_id, motor_name in enumerate(MOTOR_NAMES, start=1)}
         
         config = FeetechMotorsBusConfig(
             port=follower_port,
@@ -29,266 +126,197 @@ def main():
         )
         
         print("Step 2: Connecting to motors bus...")
-        sys.stdout.flush()
         
-        # Connect to the motors bus
+        # Connect to the motors bus, after lowering the adapter's latency timer so that each
+        # reply isn't held back for 16 ms
+        set_low_latency(follower_port)
         motors_bus = FeetechMotorsBus(config)
         motors_bus.connect()
         
         print(f"Connected to motors bus on {follower_port}")
-        sys.stdout.flush()
         
         print("Step 3: Reading initial positions for all motors...")
-        sys.stdout.flush()
         
-        # Read initial positions for all motors
-        initial_positions = {}
-        for motor_name in motors_config.keys():
-            try:
-                position = motors_bus.read("Present_Position", motor_name)[0]
-                initial_positions[motor_name] = position
-                print(f"Initial {motor_name} position: {position}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
-                initial_positions[motor_name] = 0
+        # Read initial positions for all motors with a single sync read. Only if it fails are
+        # the motors read one by one to find the missing ones.
+        try:
+            initial_positions = dict(zip(MOTOR_NAMES, motors_bus.read("Present_Position", MOTOR_NAMES)))
+        except Exception as e:
+            print(f"Error reading initial positions: {e}")
+            initial_positions = {}
+            for motor_name in MOTOR_NAMES:
+                try:
+                    initial_positions[motor_name] = motors_bus.read("Present_Position", motor_name)[0]
+                except Exception as e:
+                    print(f"Error reading {motor_name} position: {e}")
+                    initial_positions[motor_name] = 0
+        for motor_name, position in initial_positions.items():
+            print(f"Initial {motor_name} position: {position}")
         
         print("Step 4: Enabling torque for all motors...")
-        sys.stdout.flush()
         
-        # Enable torque for all motors
-        for motor_name in motors_config.keys():
-            try:
-                motors_bus.write("Torque_Enable", 1, motor_name)
-                print(f"Torque enabled for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error enabling torque for {motor_name}: {e}")
-                sys.stdout.flush()
-          # Set slower acceleration and speed for safety
+        # Enable torque for all motors with a single sync write. A sync write is one packet sent to the
+        # broadcast ID that no motor answers, so it already costs what a raw broadcast write would.
+        try:
+            motors_bus.write("Torque_Enable", 1, MOTOR_NAMES)
+            print("Torque enabled for all motors")
+        except Exception as e:
+            print(f"Error enabling torque: {e}")
+        
+        # Set slower acceleration and speed for safety
         print("Setting acceleration and speed limits for safety...")
-        sys.stdout.flush()
         
-        for motor_name in motors_config.keys():
-            try:
-                # Set acceleration to a lower value (normal is 254)
-                motors_bus.write("Acceleration", 100, motor_name)
-                # Lock parameter needs to be 0 to allow writing certain values
-                motors_bus.write("Lock", 0, motor_name)
-                print(f"Safety limits set for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error setting safety parameters for {motor_name}: {e}")
-                sys.stdout.flush()
+        try:
+            # Set acceleration to a lower value (normal is 254)
+            motors_bus.write("Acceleration", 100, MOTOR_NAMES)
+            # Lock parameter needs to be 0 to allow writing certain values
+            motors_bus.write("Lock", 0, MOTOR_NAMES)
+            print("Safety limits set for all motors")
+        except Exception as e:
+            print(f"Error setting safety parameters: {e}")
                 
         # Motor range is approximately ±180 degrees = 360 degrees total
         # 2% of range is 7.2 degrees or about 82 steps (with 4096 steps for 360 degrees)
         MOVE_AMOUNT = 82  # 2% of range (approximately 7.2 degrees)
         WAIT_TIME = 4  # Longer wait time for slower movements
         
-        # Function to check for joint limits
-        def check_joint_limits(motor_name, target_position):
-            # Read current position to have a reference point
+        # Check the joint limits of every motor at once: one sync read each of position and load,
+        # then array comparisons against the targets. Returns (safe mask, current positions).
+        def check_joint_limits_batch(target_positions):
+            # Read current positions to have a reference point
             try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                # Calculate absolute change
-                change = abs(current_pos - target_position)
-                
-                # If movement is too large (more than 25% of range = ~1024 steps), it might be dangerous
-                if change > 1024:
-                    print(f"WARNING: Movement for {motor_name} exceeds safe limits! Requested change: {change} steps")
-                    return False
-                
-                # Check if the position is within the motor's expected range
-                # STS3215 has a range of 0-4095 (absolute physical limits)
-                if target_position < 0 or target_position > 4095:
-                    print(f"WARNING: Target position {target_position} for {motor_name} is outside motor range (0-4095)")
-                    return False
-                    
-                # Additional check for load or current if approaching limits
-                # We can read Present_Load as an indicator of strain on the motor
-                try:
-                    current_load = motors_bus.read("Present_Load", motor_name)[0]
-                    if current_load > 200:  # High load indicates resistance
-                        print(f"WARNING: {motor_name} is under high load ({current_load}). Movement may be unsafe.")
-                        return False
-                except Exception:
-                    pass  # If read fails, continue with other checks
-                    
-                return True
+                current_positions = motors_bus.read("Present_Position", MOTOR_NAMES)
+            except Exception as e:
+                print(f"Error checking limits: {e}")
+                return np.zeros(len(MOTOR_NAMES), dtype=bool), None
+            
+            # We can read Present_Load as an indicator of strain on the motor
+            try:
+                current_loads = motors_bus.read("Present_Load", MOTOR_NAMES)
+            except Exception:
+                current_loads = np.zeros(len(MOTOR_NAMES))  # If read fails, continue with other checks
+            
+            # If movement is too large (more than 25% of range = ~1024 steps), it might be dangerous.
+            # STS3215 has a range of 0-4095 (absolute physical limits), and a high load (> 200)
+            # indicates resistance.
+            change = np.abs(current_positions - target_positions)
+            safe = (change <= 1024) & (target_positions >= 0) & (target_positions <= 4095) & (current_loads <= 200)
+            
+            # Explain each rejected motor
+            for i in np.flatnonzero(~safe):
+                motor_name = MOTOR_NAMES[i]
+                if change[i] > 1024:
+                    print(f"WARNING: Movement for {motor_name} exceeds safe limits! Requested change: {change[i]} steps")
+                elif not 0 <= target_positions[i] <= 4095:
+                    print(f"WARNING: Target position {target_positions[i]} for {motor_name} is outside motor range (0-4095)")
+                else:
+                    print(f"WARNING: {motor_name} is under high load ({current_loads[i]}). Movement may be unsafe.")
+            
+            return safe, current_positions
+        
+        # Send the goal positions of every motor that passed its safety check in one sync write
+        def write_goal_positions(target_positions, safe):
+            if not safe.any():
+                return
+            safe_names = [motor_name for motor_name, ok in zip(MOTOR_NAMES, safe) if ok]
+            try:
+                motors_bus.write("Goal_Position", target_positions[safe], safe_names)
+            except JointOutOfRangeError as e:
+                print(f"SAFETY ALERT: {e}")
+                print(f"Skipping movement for {', '.join(safe_names)}")
+        
+        # Print every motor's position from a single sync read
+        def log_positions(label):
+            try:
+                positions = motors_bus.read("Present_Position", MOTOR_NAMES)
             except Exception as e:
-                print(f"Error checking limits for {motor_name}: {e}")
-                return False
+                print(f"Error reading positions: {e}")
+                return
+            for motor_name, position in zip(MOTOR_NAMES, positions):
+                print(f"{motor_name} {label} position: {position}")
+        
+        # The goals of all three phases follow from the initial positions, so they are fixed up front
+        initial = np.array([initial_positions[motor_name] for motor_name in MOTOR_NAMES], dtype=np.int32)
+        forward_targets = initial + MOVE_AMOUNT
+        backward_targets = initial - MOVE_AMOUNT
                 
         print("\n===== MOVING ALL MOTORS FORWARD BY 2% =====")
-        sys.stdout.flush()
-          # First, move all motors forward by 2%
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
-            new_pos = initial_pos + MOVE_AMOUNT
-            
-            # Safety check before moving
-            if check_joint_limits(motor_name, new_pos):
+        
+        # First, move all motors forward by 2%
+        targets = forward_targets
+        
+        # Safety check before moving
+        safe, _ = check_joint_limits_batch(targets)
+        for motor_name, new_pos, initial_pos, ok in zip(MOTOR_NAMES, targets, initial, safe):
+            if ok:
                 print(f"Moving {motor_name} forward to position {new_pos} (from {initial_pos})...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", new_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Skipping movement for {motor_name}")
-                    sys.stdout.flush()
             else:
                 print(f"Skipping movement for {motor_name} due to safety limits")
-                sys.stdout.flush()
-              # Wait for all motors to reach their positions with monitoring
-        print(f"Waiting {WAIT_TIME} seconds for all motors to reach forward positions...")
-        sys.stdout.flush()
+        write_goal_positions(targets, safe)
         
-        # Monitor movement with periodic checks
-        start_time = time.time()
-        while time.time() - start_time < WAIT_TIME:
-            # Check every half second
-            time.sleep(0.5)
-            
-            # Check if all motors have completed their movements
-            all_stopped = True
-            for motor_name in motors_config.keys():
-                try:
-                    # Check if motor is still moving
-                    moving = motors_bus.read("Moving", motor_name)[0]
-                    current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                    
-                    # Also check current load as a safety measure
-                    try:
-                        current_load = motors_bus.read("Present_Load", motor_name)[0]
-                        if current_load > 250:  # Extremely high load
-                            print(f"WARNING: {motor_name} experiencing high load ({current_load})! Emergency stop.")
-                            motors_bus.write("Goal_Position", current_pos, motor_name)  # Stop at current position
-                        elif current_load > 150:  # Moderately high load
-                            print(f"Caution: {motor_name} under elevated load: {current_load}")
-                    except Exception:
-                        pass
-                        
-                    if moving != 0:
-                        all_stopped = False
-                        
-                except Exception as e:
-                    print(f"Error checking motor {motor_name} status: {e}")
-                    all_stopped = False
-            
-            # If all motors have stopped moving, we can break early
-            if all_stopped:
-                print("All motors have completed their movements")
-                break
-                
-        # Ensure we've waited the minimum time regardless
-        remaining = WAIT_TIME - (time.time() - start_time)
-        if remaining > 0:
-            time.sleep(remaining)
+        # Wait for all motors to reach their positions with monitoring
+        print(f"Waiting up to {WAIT_TIME} seconds for all motors to reach forward positions...")
+        wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
         
         # Read and display current positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} current position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
-                  print("\n===== MOVING ALL MOTORS BACKWARD BY 4% =====")
-        sys.stdout.flush()
+        log_positions("current")
+        
+        print("\n===== MOVING ALL MOTORS BACKWARD BY 4% =====")
         
         # Now move all motors backward by 4% (from +2% to -2%)
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
-            new_pos = initial_pos - MOVE_AMOUNT
-            
-            # Safety check before moving
-            if check_joint_limits(motor_name, new_pos):
-                print(f"Moving {motor_name} backward to position {new_pos} (from {motors_bus.read('Present_Position', motor_name)[0]})...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", new_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Skipping movement for {motor_name}")
-                    sys.stdout.flush()
+        targets = backward_targets
+        
+        # Safety check before moving
+        safe, current_positions = check_joint_limits_batch(targets)
+        for i, (motor_name, new_pos, ok) in enumerate(zip(MOTOR_NAMES, targets, safe)):
+            if ok:
+                print(f"Moving {motor_name} backward to position {new_pos} (from {current_positions[i]})...")
             else:
                 print(f"Skipping movement for {motor_name} due to safety limits")
-                sys.stdout.flush()
+        write_goal_positions(targets, safe)
             
         # Wait for all motors to reach their positions
-        print(f"Waiting {WAIT_TIME} seconds for all motors to reach backward positions...")
-        sys.stdout.flush()
-        time.sleep(WAIT_TIME)
+        print(f"Waiting up to {WAIT_TIME} seconds for all motors to reach backward positions...")
+        wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
         
         # Read and display current positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} current position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
-          print("\n===== RETURNING ALL MOTORS TO INITIAL POSITIONS =====")
-        sys.stdout.flush()
+        log_positions("current")
+        
+        print("\n===== RETURNING ALL MOTORS TO INITIAL POSITIONS =====")
         
         # Finally, return all motors to their initial positions
-        for motor_name in motors_config.keys():
-            initial_pos = initial_positions[motor_name]
-            
-            # Safety check before moving back to initial position
-            if check_joint_limits(motor_name, initial_pos):
+        
+        # Safety check before moving back to initial position
+        safe, _ = check_joint_limits_batch(initial)
+        for motor_name, initial_pos, ok in zip(MOTOR_NAMES, initial, safe):
+            if ok:
                 print(f"Returning {motor_name} to initial position {initial_pos}...")
-                sys.stdout.flush()
-                try:
-                    motors_bus.write("Goal_Position", initial_pos, motor_name)
-                except JointOutOfRangeError as e:
-                    print(f"SAFETY ALERT: {e}")
-                    print(f"Failed to return {motor_name} to initial position")
-                    sys.stdout.flush()
             else:
                 print(f"WARNING: Cannot safely return {motor_name} to initial position")
-                sys.stdout.flush()
+        write_goal_positions(initial, safe)
             
         # Wait for all motors to reach their initial positions
-        print(f"Waiting {WAIT_TIME} seconds for all motors to return to initial positions...")
-        sys.stdout.flush()
-        time.sleep(WAIT_TIME)
+        print(f"Waiting up to {WAIT_TIME} seconds for all motors to return to initial positions...")
+        wait_until_stopped(motors_bus, MOTOR_NAMES, WAIT_TIME)
         
         # Read and display final positions
-        for motor_name in motors_config.keys():
-            try:
-                current_pos = motors_bus.read("Present_Position", motor_name)[0]
-                print(f"{motor_name} final position: {current_pos}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error reading {motor_name} position: {e}")
-                sys.stdout.flush()
+        log_positions("final")
         
         print("\nStep 5: Disabling torque for all motors...")
-        sys.stdout.flush()
         
-        # Disable torque for all motors
-        for motor_name in motors_config.keys():
-            try:
-                motors_bus.write("Torque_Enable", 0, motor_name)
-                print(f"Torque disabled for {motor_name}")
-                sys.stdout.flush()
-            except Exception as e:
-                print(f"Error disabling torque for {motor_name}: {e}")
-                sys.stdout.flush()
+        # Disable torque for all motors with a single sync write
+        try:
+            motors_bus.write("Torque_Enable", 0, MOTOR_NAMES)
+            print("Torque disabled for all motors")
+        except Exception as e:
+            print(f"Error disabling torque: {e}")
         
         # Disconnect from the motors bus
         motors_bus.disconnect()
         print("\nDisconnected from motors bus")
-        sys.stdout.flush()
         
     except Exception as e:
         print(f"Error: {e}")
-        sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
@@ -5,31 +5,27 @@ This script helps with power cycling the servos by turning the torque
 on and off multiple times, which can sometimes help reset servo issues.
 
 Usage:
-    python power_cycle_motors.py
+    python power_cycle_motors.py [--settle SECONDS]
 """
 
-import sys
-import os
+import argparse
 import time
-import serial
-
-# Motor names for better readability
-MOTOR_NAMES = {
-    1: "Shoulder Pan",
-    2: "Shoulder Lift",
-    3: "Elbow Flex",
-    4: "Wrist Flex",
-    5: "Wrist Roll",
-    6: "Gripper"
-}
-
-# Port settings
-FOLLOWER_PORT = "COM4"
-BAUDRATE = 1000000
+
+from scs_protocol import (
+    ADDR_TORQUE_ENABLE,
+    MOTOR_IDS,
+    MOTOR_NAMES,
+    broadcast_write_byte,
+    close_port,
+    open_port,
+    ping_all,
+    sync_read,
+)
 
 # Control parameters
-MOTOR_IDS = list(range(1, 7))  # Motors 1-6
-ADDR_TORQUE_ENABLE = 0x28  # Torque enable (40)
+SETTLE_TIME = 0.2  # Wait after a torque change the motors didn't confirm (seconds); a servo applies it within ~50 ms
+CONFIRM_TIMEOUT = 0.3  # How long to poll Torque_Enable for a torque change before falling back to SETTLE_TIME
+CONFIRM_INTERVAL = 0.005
 
 def print_header():
     """Print script header"""
@@ -39,62 +35,42 @@ def print_header():
     print("\nThis tool will help reset servo motors by cycling power")
     print("Make sure the follower arm is connected and powered on")
 
-def open_port():
-    """Open the serial port for communication"""
-    try:
-        # Try to open the port
-        ser = serial.Serial(FOLLOWER_PORT, BAUDRATE, timeout=0.5)
-        print(f"Successfully opened {FOLLOWER_PORT}")
-        return ser
-    except Exception as e:
-        print(f"Error opening {FOLLOWER_PORT}: {e}")
-        return None
-
-def close_port(ser):
-    """Close the serial port"""
-    if ser:
-        ser.close()
-        print(f"Closed {FOLLOWER_PORT}")
-
-def ping_motor(ser, motor_id):
-    """Ping a motor to check if it's responsive"""
-    # Basic ping packet: 0xFF 0xFF ID 0x02 0x01 CHECKSUM
-    checksum = 0xFF - ((motor_id + 0x02 + 0x01) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x02, 0x01, checksum])
-
-    ser.write(packet)
-    time.sleep(0.1)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            return True
-        else:
-            return False
-    else:
+def check_responsive(ser):
+    """Ping all motors, report each one and return the IDs of the responsive ones"""
+    # ping_all already reports the motors that answered
+    responsive_motors = ping_all(ser, MOTOR_IDS)
+    for motor_id in MOTOR_IDS:
+        if motor_id not in responsive_motors:
+            print(f"  ✗ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) not responding")
+    return responsive_motors
+
+def broadcast_torque(ser, enable):
+    """Enable or disable torque on every motor with one broadcast write (motors don't reply to it)"""
+    broadcast_write_byte(ser, ADDR_TORQUE_ENABLE, int(bool(enable)))
+
+def wait_torque(ser, motor_ids, enable, settle=SETTLE_TIME):
+    """Poll Torque_Enable until every motor reports the requested state
+
+    Gives up after CONFIRM_TIMEOUT and waits out settle instead, so motors that can't confirm
+    still get the time they had before. Returns whether all motors confirmed.
+    """
+    pending = set(motor_ids)
+    deadline = time.monotonic() + CONFIRM_TIMEOUT
+    while True:
+        # One SYNC READ of Torque_Enable covers every motor still pending
+        torque = sync_read(ser, sorted(pending), ADDR_TORQUE_ENABLE, 1)
+        pending = {motor_id for motor_id in pending if torque.get(motor_id) != int(enable)}
+        if not pending or time.monotonic() >= deadline:
+            break
+        time.sleep(CONFIRM_INTERVAL)
+
+    if pending:
+        print(f"    ! Motors {sorted(pending)} didn't confirm the torque change, waiting {settle} seconds...")
+        time.sleep(settle)
         return False
+    return True
 
-def set_torque(ser, motor_id, enable):
-    """Enable or disable torque on a motor"""
-    value = 1 if enable else 0
-    state = "ON" if enable else "OFF"
-
-    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 CHECKSUM
-    checksum = 0xFF - ((motor_id + 0x04 + 0x03 + ADDR_TORQUE_ENABLE + value) % 256)
-    packet = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x03, ADDR_TORQUE_ENABLE, value, checksum])
-
-    ser.write(packet)
-    time.sleep(0.05)  # Wait for response
-
-    if ser.in_waiting:
-        response = ser.read(ser.in_waiting)
-        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-            return True
-        else:
-            return False
-    return False
-
-def power_cycle_motors():
+def power_cycle_motors(settle=SETTLE_TIME):
     """Perform power cycling on motors"""
     print_header()
 
@@ -107,13 +83,7 @@ def power_cycle_motors():
     try:
         # Check which motors are responsive
         print("\nChecking for responsive motors...")
-        responsive_motors = []
-        for motor_id in MOTOR_IDS:
-            if ping_motor(ser, motor_id):
-                print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) is responsive")
-                responsive_motors.append(motor_id)
-            else:
-                print(f"  ✗ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) not responding")
+        responsive_motors = check_responsive(ser)
 
         if not responsive_motors:
             print("\nNo motors are responding. Check connections and power.")
@@ -129,41 +99,27 @@ def power_cycle_motors():
 
             # Turn torque OFF
             print("  Turning torque OFF...")
-            for motor_id in responsive_motors:
-                success = set_torque(ser, motor_id, False)
-                if success:
-                    print(f"    ✓ Motor {motor_id} torque disabled")
-                else:
-                    print(f"    ✗ Failed to disable torque on motor {motor_id}")
+            broadcast_torque(ser, False)
+            print("    ✓ Torque disable sent to all motors")
 
-            # Wait
-            print("  Waiting 2 seconds...")
-            time.sleep(2.0)
+            # Wait until the motors report torque off
+            if wait_torque(ser, responsive_motors, False, settle):
+                print("    ✓ All motors report torque off")
 
             # Turn torque ON
             print("  Turning torque ON...")
-            for motor_id in responsive_motors:
-                success = set_torque(ser, motor_id, True)
-                if success:
-                    print(f"    ✓ Motor {motor_id} torque enabled")
-                else:
-                    print(f"    ✗ Failed to enable torque on motor {motor_id}")
+            broadcast_torque(ser, True)
+            print("    ✓ Torque enable sent to all motors")
 
-            # Wait
-            print("  Waiting 2 seconds...")
-            time.sleep(2.0)
+            # Wait until the motors report torque on
+            if wait_torque(ser, responsive_motors, True, settle):
+                print("    ✓ All motors report torque on")
 
         print("\nPower cycling complete!")
         print("\nVerifying motors are still responsive...")
 
         # Check which motors are still responsive
-        final_responsive = []
-        for motor_id in MOTOR_IDS:
-            if ping_motor(ser, motor_id):
-                print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) is responsive")
-                final_responsive.append(motor_id)
-            else:
-                print(f"  ✗ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) not responding")
+        final_responsive = check_responsive(ser)
 
         print(f"\nFound {len(final_responsive)} responsive motors after power cycling.")
         print("\nNext steps:")
@@ -175,4 +131,15 @@ def power_cycle_motors():
         close_port(ser)
 
 if __name__ == "__main__":
-    power_cycle_motors()
+    parser = argparse.ArgumentParser(description="Cycle torque off and on to reset the follower arm servos")
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=SETTLE_TIME,
+        help=(
+            f"Seconds to wait after a torque change the motors don't confirm within {CONFIRM_TIMEOUT} s "
+            f"(default {SETTLE_TIME}; the tool used to wait 2.0)"
+        ),
+    )
+    args = parser.parse_args()
+    power_cycle_motors(args.settle)
@@ -10,12 +10,14 @@ to ensure they respond to position commands correctly. It will:
 4. Test movement on each motor
 
 Usage:
-    python reset_follower_motors.py
+    python reset_follower_motors.py [--verbose]
 """
 
+import argparse
+import atexit
+import logging
 import sys
 import os
-import time
 import signal
 
 # Add the parent directory to sys.path
@@ -28,13 +30,14 @@ except ImportError:
     print("Failed to import scservo_sdk. Make sure it's installed.")
     sys.exit(1)
 
+from bus import BAUDRATE, close_bus, get_bus, sync_read, sync_write, wait_until_stopped
+
 # Port settings
 FOLLOWER_PORT = "COM4"
-BAUDRATE = 1000000
-PROTOCOL = 0  # Protocol 0 for SCServo SCS
 
 # Motor IDs
 MOTOR_IDS = list(range(1, 7))  # Motors 1-6
+BROADCAST_ID = 0xFE  # Every motor executes a packet sent here, and none replies
 
 # Control parameters
 CENTER_POSITION = 2048  # Center position (0 degree)
@@ -56,7 +59,7 @@ ADDR_GOAL_POSITION = 42       # Goal position
 ADDR_OPERATING_MODE = 11      # Operating mode
 ADDR_MAX_TORQUE = 34          # Max torque setting
 ADDR_GOAL_SPEED = 46          # Movement speed
-ADDR_RETURN_DELAY = 5         # Return delay time
+ADDR_RETURN_DELAY = 7         # Return delay time (address 5 is the motor ID)
 ADDR_COMPLIANCE_P_GAIN = 29   # Position P gain
 ADDR_COMPLIANCE_D_GAIN = 28   # Position D gain
 ADDR_COMPLIANCE_I_GAIN = 27   # Position I gain
@@ -66,268 +69,285 @@ ADDR_ALARM_SHUTDOWN = 18      # Alarm shutdown flags
 ADDR_VOLTAGE_LIMIT = 22       # Voltage limit
 ADDR_TEMPERATURE_LIMIT = 20   # Temperature limit
 ADDR_TORQUE_LIMIT = 35        # Torque limit
+ADDR_PRESENT_VOLTAGE = 62     # Present voltage, in 0.1 V
+ADDR_PRESENT_TEMPERATURE = 63 # Present temperature, in °C
+
+# Max torque through present temperature is one contiguous range that covers every status register
+# except the operating mode, so a single SYNC READ of it fetches them all for every motor
+STATUS_BLOCK_ADDR = ADDR_MAX_TORQUE
+STATUS_BLOCK_LEN = ADDR_PRESENT_TEMPERATURE + 1 - STATUS_BLOCK_ADDR
+
+# Per-register progress goes to this logger, which stays silent unless --verbose is given, so
+# console output doesn't slow down the serial transactions it sits between
+log = logging.getLogger("reset_follower_motors")
+log.addHandler(logging.NullHandler())
 
 def signal_handler(sig, frame):
+    # Closing the port here could cut a transaction short; exiting unwinds to main's cleanup instead
     print("\nExiting program...")
-    follower_port_handler.closePort()
     sys.exit(0)
 
-# Initialize port handlers
-follower_port_handler = scs.PortHandler(FOLLOWER_PORT)
-follower_packet_handler = scs.PacketHandler(PROTOCOL)
+def bootstrap_bus():
+    """Make every motor reply without delay before the first request that waits for a reply"""
+    port, packet = get_bus(FOLLOWER_PORT)
+    # A servo waits its return delay before every status packet, so it is zeroed on all motors
+    # with one broadcast instead of as part of the reset
+    result = packet.write1ByteTxOnly(port, BROADCAST_ID, ADDR_RETURN_DELAY, 0)
+    if result != scs.COMM_SUCCESS:
+        print(f"✗ Failed to set return delay: {packet.getTxRxResult(result)}")
+    else:
+        print(f"✓ Set return delay to minimum on all motors")
 
 def open_port():
     """Open the follower port with error handling"""
     try:
-        if follower_port_handler.openPort():
-            print(f"✓ Successfully opened follower port {FOLLOWER_PORT}")
-        else:
-            print(f"✗ Failed to open follower port {FOLLOWER_PORT}")
-            return False
-
-        if follower_port_handler.setBaudRate(BAUDRATE):
-            print(f"✓ Changed follower baudrate to {BAUDRATE}")
-        else:
-            print(f"✗ Failed to change follower baudrate")
-            follower_port_handler.closePort()
-            return False
-
-        return True
+        get_bus(FOLLOWER_PORT)
     except Exception as e:
         print(f"✗ Error with follower port: {e}")
         return False
 
-def reset_motor(motor_id):
-    """Reset critical motor parameters to defaults"""
-    print(f"Resetting motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')})...")
+    print(f"✓ Opened follower port {FOLLOWER_PORT} at {BAUDRATE} baud")
+    bootstrap_bus()
+    return True
+
+# Parameters reset_motors writes to every motor: (address, length, value, description)
+_RESET_VALUES = [
+    (ADDR_OPERATING_MODE, 1, 0, "position control mode"),          # Reset to position control mode
+    (ADDR_MAX_TORQUE, 2, 1023, "max torque to 100%"),
+    (ADDR_GOAL_SPEED, 2, 500, "goal speed"),                        # Medium-fast
+    (ADDR_COMPLIANCE_P_GAIN, 1, 32, "P gain"),                      # Control stiffness
+    (ADDR_COMPLIANCE_MARGIN, 1, 0, "compliance margin"),            # Deadband, lower is more precise
+    (ADDR_PUNCH, 2, 200, "punch"),                                  # Minimum current, higher means more power/less precision
+    (ADDR_ALARM_SHUTDOWN, 1, 3, "alarm shutdown conditions"),
+]
+
+# The same values go to every motor on every reset, so they are encoded to register bytes once here:
+# (address, length, data, description)
+RESET_PARAMS = [
+    (address, length, list(value.to_bytes(length, "little")), description)
+    for address, length, value, description in _RESET_VALUES
+]
+
+def sync_write_data(address, length, motor_ids, data):
+    """Write the same already-encoded register bytes to several motors with one SYNC WRITE packet"""
+    port, packet = get_bus(FOLLOWER_PORT)
+    group = scs.GroupSyncWrite(port, packet, address, length)
+    for motor_id in motor_ids:
+        group.addParam(motor_id, data)
+    return group.txPacket()
+
+def reset_motors(motor_ids):
+    """Reset critical motor parameters to defaults on all motors at once
+
+    Every register is set on all motors with a single SYNC WRITE, so the whole reset costs one
+    packet per register instead of one round-trip per register and motor.
+    """
+    port, packet = get_bus(FOLLOWER_PORT)
+    print(f"Resetting motors {motor_ids}...")
 
     # Disable torque first (required to change some settings)
-    result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_TORQUE_ENABLE, 0)
+    result = sync_write(port, packet, ADDR_TORQUE_ENABLE, 1, {motor_id: 0 for motor_id in motor_ids})
     if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to disable torque: {follower_packet_handler.getTxRxResult(result)}")
+        print(f"  ✗ Failed to disable torque: {packet.getTxRxResult(result)}")
         return False
 
-    # Reset to position control mode
-    result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_OPERATING_MODE, 0)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to set position control mode: {follower_packet_handler.getTxRxResult(result)}")
-    else:
-        print(f"  ✓ Set position control mode")
-
-    # Set max torque to 100%
-    result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_MAX_TORQUE, 1023)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to set max torque: {follower_packet_handler.getTxRxResult(result)}")
-    else:
-        print(f"  ✓ Set max torque to 100%")
-
-    # Set goal speed to medium-fast value
-    result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_GOAL_SPEED, 500)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to set goal speed: {follower_packet_handler.getTxRxResult(result)}")
-    else:
-        print(f"  ✓ Set goal speed")
-
-    # Set return delay time to minimum
-    result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_RETURN_DELAY, 0)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to set return delay: {follower_packet_handler.getTxRxResult(result)}")
-    else:
-        print(f"  ✓ Set return delay to minimum")
-
-    # Set compliance P gain (control stiffness)
-    try:
-        result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_COMPLIANCE_P_GAIN, 32)
-        if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to set P gain: {follower_packet_handler.getTxRxResult(result)}")
-        else:
-            print(f"  ✓ Set P gain")
-    except Exception as e:
-        print(f"  ✗ Error setting P gain: {e}")
-
-    # Set compliance margin (deadband, lower is more precise)
-    try:
-        result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_COMPLIANCE_MARGIN, 0)
-        if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to set compliance margin: {follower_packet_handler.getTxRxResult(result)}")
-        else:
-            print(f"  ✓ Set compliance margin")
-    except Exception as e:
-        print(f"  ✗ Error setting compliance margin: {e}")
-
-    # Set punch (minimum current, higher means more power/less precision)
-    try:
-        result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_PUNCH, 200)
-        if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to set punch: {follower_packet_handler.getTxRxResult(result)}")
-        else:
-            print(f"  ✓ Set punch")
-    except Exception as e:
-        print(f"  ✗ Error setting punch: {e}")
-
-    # Reset alarm shutdown conditions
-    try:
-        result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_ALARM_SHUTDOWN, 3)
+    params_set = 0
+    for address, length, data, description in RESET_PARAMS:
+        result = sync_write_data(address, length, motor_ids, data)
         if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to reset alarm: {follower_packet_handler.getTxRxResult(result)}")
+            print(f"  ✗ Failed to set {description}: {packet.getTxRxResult(result)}")
         else:
-            print(f"  ✓ Reset alarm shutdown conditions")
-    except Exception as e:
-        print(f"  ✗ Error resetting alarm: {e}")
+            log.debug("  ✓ Set %s", description)
+            params_set += 1
+    print(f"  ✓ Set {params_set}/{len(RESET_PARAMS)} parameters")
 
     # Re-enable torque
-    result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_TORQUE_ENABLE, 1)
+    result = sync_write(port, packet, ADDR_TORQUE_ENABLE, 1, {motor_id: 1 for motor_id in motor_ids})
     if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to enable torque: {follower_packet_handler.getTxRxResult(result)}")
+        print(f"  ✗ Failed to enable torque: {packet.getTxRxResult(result)}")
         return False
-    else:
-        print(f"  ✓ Torque enabled")
-
-    return True
 
-def test_motor_movement(motor_id):
-    """Test if motor can move to target position"""
-    print(f"Testing movement on motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')})...")
-
-    # Read current position
-    position, result, error = follower_packet_handler.read2ByteTxRx(follower_port_handler, motor_id, ADDR_PRESENT_POSITION)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to read position: {follower_packet_handler.getTxRxResult(result)}")
-        return False
-
-    print(f"  Current position: {position}")
+    # Sync writes get no reply, so read the torque state back to see which motors took the reset
+    torque = sync_read(port, packet, ADDR_TORQUE_ENABLE, 1, motor_ids)
+    for motor_id in motor_ids:
+        if torque.get(motor_id) == 1:
+            print(f"  ✓ Motor {motor_id} torque enabled")
+        else:
+            print(f"  ✗ Motor {motor_id} did not confirm torque enable")
+    return all(torque.get(motor_id) == 1 for motor_id in motor_ids)
+
+def test_motors_movement(motor_ids):
+    """Test if the motors can move to target positions, moving them all at once
+
+    Each step covers every motor with one sync read or write, so no motor waits for the others'
+    round-trips and the moves overlap. Returns {motor_id: success}.
+    """
+    port, packet = get_bus(FOLLOWER_PORT)
+    print(f"Testing movement on motors {motor_ids}...")
+
+    # Read current positions
+    positions = sync_read(port, packet, ADDR_PRESENT_POSITION, 2, motor_ids)
+    for motor_id in motor_ids:
+        if motor_id not in positions:
+            print(f"  ✗ Motor {motor_id}: failed to read position")
+    log.debug("  Current positions: %s", positions)
+    if not positions:
+        return {motor_id: False for motor_id in motor_ids}
 
     # Move 100 steps clockwise
-    target_position = (position + 100) % 4096
-    print(f"  Moving to position: {target_position}")
+    targets = {motor_id: (position + 100) % 4096 for motor_id, position in positions.items()}
+    log.debug("  Moving to positions: %s", targets)
 
-    result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_GOAL_POSITION, target_position)
+    result = sync_write(port, packet, ADDR_GOAL_POSITION, 2, targets)
     if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to send command: {follower_packet_handler.getTxRxResult(result)}")
-        return False
+        print(f"  ✗ Failed to send command: {packet.getTxRxResult(result)}")
+        return {motor_id: False for motor_id in motor_ids}
 
     # Wait for movement
-    time.sleep(1)
+    wait_until_stopped(port, packet, list(targets))
+
+    # Read new positions
+    new_positions = sync_read(port, packet, ADDR_PRESENT_POSITION, 2, list(targets))
+    log.debug("  New positions: %s", new_positions)
+
+    # Calculate differences
+    results = {motor_id: False for motor_id in motor_ids}
+    for motor_id, target_position in targets.items():
+        label = f"Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')})"
+        if motor_id not in new_positions:
+            print(f"  ✗ {label}: failed to read new position")
+            continue
+        position, new_position = positions[motor_id], new_positions[motor_id]
+        diff = abs(new_position - target_position)
+        if diff < 20:
+            print(f"  ✓ {label} moved successfully! ({position} -> {new_position}, difference: {diff})")
+            results[motor_id] = True
+        else:
+            print(f"  ✗ {label} did not move correctly ({position} -> {new_position}, target {target_position}, difference: {diff})")
 
-    # Read new position
-    new_position, result, error = follower_packet_handler.read2ByteTxRx(follower_port_handler, motor_id, ADDR_PRESENT_POSITION)
+    # Return to original positions
+    result = sync_write(port, packet, ADDR_GOAL_POSITION, 2, positions)
     if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to read new position: {follower_packet_handler.getTxRxResult(result)}")
-        return False
+        print(f"  ✗ Failed to return to original positions: {packet.getTxRxResult(result)}")
+    else:
+        log.debug("  ✓ Returned to original positions")
+        wait_until_stopped(port, packet, list(positions))
 
-    print(f"  New position: {new_position}")
+    return results
 
-    # Calculate difference
-    diff = abs(new_position - target_position)
-    if diff < 20:
-        print(f"  ✓ Motor moved successfully! (Difference: {diff})")
-        success = True
-    else:
-        print(f"  ✗ Motor did not move correctly (Difference: {diff})")
-        success = False
+def read_motors_status(motor_ids):
+    """Read and display detailed status of the motors with two SYNC READs covering all of them"""
+    port, packet = get_bus(FOLLOWER_PORT)
 
-    # Return to original position
-    result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_GOAL_POSITION, position)
-    if result != scs.COMM_SUCCESS:
-        print(f"  ✗ Failed to return to original position: {follower_packet_handler.getTxRxResult(result)}")
-    else:
-        print(f"  ✓ Returned to original position")
-        time.sleep(1)
+    status = scs.GroupSyncRead(port, packet, STATUS_BLOCK_ADDR, STATUS_BLOCK_LEN)
+    for motor_id in motor_ids:
+        status.addParam(motor_id)
+    status_read = status.txRxPacket() == scs.COMM_SUCCESS
+    modes = sync_read(port, packet, ADDR_OPERATING_MODE, 1, motor_ids)
 
-    return success
+    for motor_id in motor_ids:
+        print(f"Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) status:")
 
-def read_motor_status(motor_id):
-    """Read and display detailed motor status"""
-    print(f"Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) status:")
+        def field(address, length):
+            """A register from this motor's status block, or None if the block wasn't read"""
+            if status_read and status.isAvailable(motor_id, address, length):
+                return status.getData(motor_id, address, length)
+            return None
 
-    try:
-        # Read position
-        position, pos_result, _ = follower_packet_handler.read2ByteTxRx(follower_port_handler, motor_id, ADDR_PRESENT_POSITION)
-        if pos_result == scs.COMM_SUCCESS:
+        # Position
+        position = field(ADDR_PRESENT_POSITION, 2)
+        if position is not None:
             print(f"  Position: {position}")
         else:
             print(f"  Position: ERROR")
 
-        # Read operating mode
-        mode, mode_result, _ = follower_packet_handler.read1ByteTxRx(follower_port_handler, motor_id, ADDR_OPERATING_MODE)
-        if mode_result == scs.COMM_SUCCESS:
+        # Operating mode
+        mode = modes.get(motor_id)
+        if mode is not None:
             mode_str = "Position Control" if mode == 0 else f"Other Mode ({mode})"
             print(f"  Operating Mode: {mode_str}")
         else:
             print(f"  Operating Mode: ERROR")
 
-        # Read torque status
-        torque, torque_result, _ = follower_packet_handler.read1ByteTxRx(follower_port_handler, motor_id, ADDR_TORQUE_ENABLE)
-        if torque_result == scs.COMM_SUCCESS:
-            status = "ENABLED" if torque == 1 else "DISABLED"
-            print(f"  Torque: {status}")
+        # Torque status
+        torque = field(ADDR_TORQUE_ENABLE, 1)
+        if torque is not None:
+            status_str = "ENABLED" if torque == 1 else "DISABLED"
+            print(f"  Torque: {status_str}")
         else:
             print(f"  Torque: ERROR")
 
-        # Read max torque
-        max_torque, max_torque_result, _ = follower_packet_handler.read2ByteTxRx(follower_port_handler, motor_id, ADDR_MAX_TORQUE)
-        if max_torque_result == scs.COMM_SUCCESS:
+        # Max torque
+        max_torque = field(ADDR_MAX_TORQUE, 2)
+        if max_torque is not None:
             print(f"  Max Torque: {max_torque}/1023 ({max_torque/10.23:.1f}%)")
         else:
             print(f"  Max Torque: ERROR")
 
-        # Read voltage
-        voltage, voltage_result, _ = follower_packet_handler.read1ByteTxRx(follower_port_handler, motor_id, 62)  # Voltage at register 62
-        if voltage_result == scs.COMM_SUCCESS:
+        # Voltage
+        voltage = field(ADDR_PRESENT_VOLTAGE, 1)
+        if voltage is not None:
             print(f"  Voltage: {voltage/10.0}V")
         else:
             print(f"  Voltage: ERROR")
 
-        # Read temperature
-        temp, temp_result, _ = follower_packet_handler.read1ByteTxRx(follower_port_handler, motor_id, 63)  # Temperature at register 63
-        if temp_result == scs.COMM_SUCCESS:
+        # Temperature
+        temp = field(ADDR_PRESENT_TEMPERATURE, 1)
+        if temp is not None:
             print(f"  Temperature: {temp}°C")
         else:
             print(f"  Temperature: ERROR")
 
-    except Exception as e:
-        print(f"  Error reading status: {e}")
+        print()
 
 def set_to_center_position():
     """Set all follower motors to center position"""
+    port, packet = get_bus(FOLLOWER_PORT)
     print("\nSetting all motors to center position...")
 
-    for motor_id in MOTOR_IDS:
-        print(f"Moving motor {motor_id} to center position ({CENTER_POSITION})...")
+    print(f"Moving motors {MOTOR_IDS} to center position ({CENTER_POSITION})...")
 
-        # Enable torque first
-        result, error = follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, ADDR_TORQUE_ENABLE, 1)
-        if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to enable torque: {follower_packet_handler.getTxRxResult(result)}")
-            continue
+    # Enable torque first, on every motor with one sync write
+    result = sync_write(port, packet, ADDR_TORQUE_ENABLE, 1, {motor_id: 1 for motor_id in MOTOR_IDS})
+    if result != scs.COMM_SUCCESS:
+        print(f"  ✗ Failed to enable torque: {packet.getTxRxResult(result)}")
+        return
 
-        # Set position to center
-        result, error = follower_packet_handler.write2ByteTxRx(follower_port_handler, motor_id, ADDR_GOAL_POSITION, CENTER_POSITION)
-        if result != scs.COMM_SUCCESS:
-            print(f"  ✗ Failed to send command: {follower_packet_handler.getTxRxResult(result)}")
-        else:
-            print(f"  ✓ Command sent successfully")
+    # Set every position to center with one more
+    result = sync_write(port, packet, ADDR_GOAL_POSITION, 2, {motor_id: CENTER_POSITION for motor_id in MOTOR_IDS})
+    if result != scs.COMM_SUCCESS:
+        print(f"  ✗ Failed to send command: {packet.getTxRxResult(result)}")
+    else:
+        log.debug("  ✓ Command sent successfully")
 
-    # Wait for movement to complete
+    # Wait for movement to complete, for at most the 3 seconds this used to sleep
     print("Waiting for movement to complete...")
-    time.sleep(3)
+    if not wait_until_stopped(port, packet, MOTOR_IDS, timeout=3):
+        print("  ✗ Motors still moving after 3 seconds")
 
     # Check final positions
     print("\nVerifying final positions:")
+    positions = sync_read(port, packet, ADDR_PRESENT_POSITION, 2, MOTOR_IDS)
     for motor_id in MOTOR_IDS:
-        position, result, error = follower_packet_handler.read2ByteTxRx(follower_port_handler, motor_id, ADDR_PRESENT_POSITION)
-        if result == scs.COMM_SUCCESS:
+        if motor_id in positions:
+            position = positions[motor_id]
             diff = abs(position - CENTER_POSITION)
             if diff < 20:
                 print(f"  ✓ Motor {motor_id} at position {position} (diff: {diff})")
             else:
                 print(f"  ✗ Motor {motor_id} at position {position}, off target by {diff}")
         else:
-            print(f"  ✗ Failed to read position of motor {motor_id}: {follower_packet_handler.getTxRxResult(result)}")
+            print(f"  ✗ Failed to read position of motor {motor_id}")
+
+def main(verbose=False):
+    if verbose:
+        log.addHandler(logging.StreamHandler(sys.stdout))
+        log.setLevel(logging.DEBUG)
 
-def main():
-    # Set up signal handler for graceful exit
+    # Set up signal handler for graceful exit. close_bus does nothing for a port that is already
+    # closed or was never opened, so the atexit hook is a safe backstop for any way out of main
     signal.signal(signal.SIGINT, signal_handler)
+    atexit.register(close_bus, FOLLOWER_PORT)
 
     print("=== SO-101 Follower Motor Reset Tool ===")
 
@@ -339,38 +359,35 @@ def main():
     try:
         # Read initial status
         print("\n=== Initial Motor Status ===")
-        for motor_id in MOTOR_IDS:
-            read_motor_status(motor_id)
-            print()
+        read_motors_status(MOTOR_IDS)
 
         # Reset all motors
         print("\n=== Resetting Motor Parameters ===")
-        for motor_id in MOTOR_IDS:
-            reset_motor(motor_id)
-            print()
+        reset_motors(MOTOR_IDS)
+        print()
 
         # Test movement
         print("\n=== Testing Motor Movement ===")
-        for motor_id in MOTOR_IDS:
-            test_motor_movement(motor_id)
-            print()
+        test_motors_movement(MOTOR_IDS)
+        print()
 
         # Set to center position
         set_to_center_position()
 
         # Read final status
         print("\n=== Final Motor Status ===")
-        for motor_id in MOTOR_IDS:
-            read_motor_status(motor_id)
-            print()
+        read_motors_status(MOTOR_IDS)
 
         print("\nMotor reset and test complete!")
         print("You can now run the teleoperation script.")
 
     finally:
         # Clean up
-        follower_port_handler.closePort()
-        print("Port closed.")
+        if close_bus(FOLLOWER_PORT):
+            print("Port closed.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Reset the follower arm servos and test their movement")
+    parser.add_argument("--verbose", action="store_true", help="Report every register write and intermediate position")
+    args = parser.parse_args()
+    main(args.verbose)
@@ -0,0 +1,376 @@
+"""
+SCServo Direct Serial Protocol
+
+Shared helpers for talking to the SO-101 follower arm motors over a raw serial port,
+used by the follower recovery and test scripts:
+
+1. Packet framing, checksums and status-packet parsing
+2. A worker thread that owns the port and services request/reply transactions
+3. Single-motor, broadcast and SYNC WRITE / SYNC READ register access
+4. Broadcast ping and MOVING-flag polling across several motors
+5. Lowering the USB-serial adapter's latency timer and setting the tty's low latency mode
+
+Usage:
+    from scs_protocol import open_port, close_port, ping_all, sync_read_word
+"""
+
+import itertools
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import serial
+
+# Motor names for better readability
+MOTOR_NAMES = {
+    1: "Shoulder Pan",
+    2: "Shoulder Lift",
+    3: "Elbow Flex",
+    4: "Wrist Flex",
+    5: "Wrist Roll",
+    6: "Gripper"
+}
+
+# Port settings
+FOLLOWER_PORT = "COM4"
+BAUDRATE = 1000000
+
+# Control parameters
+MOTOR_IDS = list(range(1, 7))  # Motors 1-6
+CENTER_POSITION = 2048  # Center position (0 degree)
+
+# Key register addresses for SCServo motors
+ADDR_TORQUE_ENABLE = 0x28       # Torque enable (40)
+ADDR_PRESENT_POSITION = 0x38    # Present position (56)
+ADDR_GOAL_POSITION = 0x2A       # Goal position (42)
+ADDR_OPERATING_MODE = 0x0B      # Operating mode (11)
+ADDR_MAX_TORQUE = 0x22          # Max torque setting (34)
+ADDR_GOAL_SPEED = 0x2E          # Movement speed (46)
+ADDR_RETURN_DELAY = 0x07        # Return delay time (7); 0x05 is the motor ID
+ADDR_ALARM_SHUTDOWN = 0x12      # Alarm shutdown flags (18)
+ADDR_LED = 0x29                 # LED control (41)
+ADDR_MOVING = 0x42              # Moving flag, 1 while travelling to a goal (66)
+
+# Instructions
+INST_PING = 0x01
+INST_READ = 0x02
+INST_WRITE = 0x03
+INST_SYNC_READ = 0x82
+INST_SYNC_WRITE = 0x83
+
+BROADCAST_ID = 0xFE
+STATUS_PACKET_LEN = 6           # 0xFF 0xFF ID LENGTH ERROR CHECKSUM
+REPLY_TIMEOUT = 0.1             # Serial read timeout for one reply (seconds)
+MOVE_TIMEOUT = 1.5              # Upper bound on waiting for a move to settle (seconds)
+LATENCY_TIMER_MS = 1            # FTDI adapters default to 16 ms, which they add to every reply
+
+PACKET_HEADER = b"\xff\xff"
+
+def _cksum(payload):
+    """SCServo checksum: inverted low byte of the sum over ID, LENGTH, INSTRUCTION and params"""
+    return (~sum(payload)) & 0xFF
+
+def build_packet(payload):
+    """Frame a payload (ID LENGTH INSTRUCTION PARAMS...) with header and checksum"""
+    return PACKET_HEADER + payload + bytes((_cksum(payload),))
+
+# Preallocated scratch buffers for the hot write/read paths, header bytes filled in once.
+# Reuse is safe because every request waits for its reply before the next one is built.
+_WRITE_BUF = bytearray(PACKET_HEADER) + bytearray(14)
+_READ_BUF = bytearray(PACKET_HEADER) + bytearray(14)
+_WRITE_BYTE_FMT = struct.Struct("<5B")   # ID LENGTH INSTRUCTION ADDRESS VALUE
+_WRITE_WORD_FMT = struct.Struct("<4BH")  # ID LENGTH INSTRUCTION ADDRESS VALUE_L VALUE_H
+_READ_FMT = struct.Struct("<5B")         # ID LENGTH INSTRUCTION ADDRESS LENGTH
+
+def _pack_packet(buf, fmt, *payload):
+    """Pack a payload into a scratch buffer after the header and append the checksum"""
+    fmt.pack_into(buf, 2, *payload)
+    end = 2 + fmt.size
+    view = memoryview(buf)
+    buf[end] = _cksum(view[2:end])
+    return view[:end + 1]
+
+def parse_status_packets(raw):
+    """Split a buffer of concatenated status packets into {motor_id: packet} for valid frames"""
+    packets = {}
+    i = raw.find(PACKET_HEADER)
+    while 0 <= i and i + 4 <= len(raw):
+        end = i + 4 + raw[i + 3]
+        if end > len(raw):
+            break
+        if raw[end - 1] == _cksum(raw[i + 2:end - 1]):
+            packets[raw[i + 2]] = raw[i:end]
+            i = raw.find(PACKET_HEADER, end)
+        else:
+            i = raw.find(PACKET_HEADER, i + 1)
+    return packets
+
+class SerialWorker(threading.Thread):
+    """Thread that owns the serial port and services (packet, expected_len) requests in order.
+
+    Callers build packets while the worker waits on the bus, and every request gets a Future
+    resolving to the raw reply bytes (possibly short or empty on timeout).
+    """
+
+    def __init__(self, ser):
+        super().__init__(daemon=True)
+        self.ser = ser
+        self.requests = queue.Queue()
+
+    def submit(self, packet, expected_len):
+        future = Future()
+        self.requests.put((packet, expected_len, future))
+        return future
+
+    def transact(self, packet, expected_len):
+        return self.submit(packet, expected_len).result(timeout=REPLY_TIMEOUT + 0.5)
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            packet, expected_len, future = request
+            try:
+                self.ser.reset_input_buffer()
+                self.ser.write(packet)
+                future.set_result(self.ser.read(expected_len) if expected_len else b"")
+            except Exception as e:
+                future.set_exception(e)
+
+    def close(self):
+        self.requests.put(None)
+        self.join()
+        self.ser.close()
+
+def _set_latency_sysfs(port_name):
+    """Write the latency timer of a Linux usb-serial adapter through sysfs"""
+    tty = os.path.basename(os.path.realpath(port_name))
+    path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+    if not os.path.exists(path):
+        return False  # Not an adapter with a latency timer
+    with open(path, "w") as f:
+        f.write(str(LATENCY_TIMER_MS))
+    return True
+
+def _set_latency_windows(port_name):
+    """Set the LatencyTimer registry value of the FTDI device that owns port_name"""
+    import winreg
+
+    try:
+        ftdibus = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Enum\FTDIBUS")
+    except FileNotFoundError:
+        return False  # No FTDI driver installed, so the adapter has no latency timer
+    with ftdibus:
+        for i in itertools.count():
+            try:
+                params_path = rf"{winreg.EnumKey(ftdibus, i)}\0000\Device Parameters"
+            except OSError:
+                return False  # No FTDI device is bound to this port
+            try:
+                with winreg.OpenKey(ftdibus, params_path) as params:
+                    if winreg.QueryValueEx(params, "PortName")[0] != port_name:
+                        continue
+            except FileNotFoundError:
+                continue
+            with winreg.OpenKey(ftdibus, params_path, 0, winreg.KEY_SET_VALUE) as params:
+                winreg.SetValueEx(params, "LatencyTimer", 0, winreg.REG_DWORD, LATENCY_TIMER_MS)
+            return True
+
+def set_low_latency(port_name=FOLLOWER_PORT):
+    """Lower the USB-serial adapter's latency timer to LATENCY_TIMER_MS, returning whether it was set
+
+    FTDI adapters hold received bytes for up to their latency timer (16 ms by default) before
+    passing them on, which dominates every request/reply round-trip at 1 Mbaud. Changing it needs
+    root on Linux and administrator rights on Windows, where the driver only picks the new value up
+    once the adapter is reconnected. Without those rights the port still works, just slower.
+    """
+    try:
+        if sys.platform == "win32":
+            return _set_latency_windows(port_name)
+        return _set_latency_sysfs(port_name)
+    except OSError as e:
+        print(f"Could not lower the latency timer of {port_name}: {e}")
+        return False
+
+def set_async_low_latency(ser):
+    """Set ASYNC_LOW_LATENCY on an open Linux serial port, returning whether it was set
+
+    The flag makes the tty layer hand received bytes to readers immediately instead of batching
+    them. It complements the adapter's latency timer, which set_low_latency lowers.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        ser.set_low_latency_mode(True)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"Could not set low latency mode on {ser.port}: {e}")
+        return False
+
+def set_port_low_latency(port_handler):
+    """Lower the latency of the port behind an open scservo_sdk PortHandler, returning whether the timer was set
+
+    Call it after setBaudRate, which reopens the underlying serial port and loses its flags.
+    """
+    set_async_low_latency(port_handler.ser)
+    return set_low_latency(port_handler.port_name)
+
+def open_port(port_name=FOLLOWER_PORT, baudrate=BAUDRATE):
+    """Open the serial port and start the worker thread that owns it"""
+    set_low_latency(port_name)
+    try:
+        # Try to open the port
+        ser = serial.Serial(port_name, baudrate, timeout=REPLY_TIMEOUT)
+        set_async_low_latency(ser)
+        print(f"Successfully opened {port_name}")
+        worker = SerialWorker(ser)
+        worker.start()
+        return worker
+    except Exception as e:
+        print(f"Error opening {port_name}: {e}")
+        return None
+
+def close_port(ser):
+    """Stop the worker thread and close the serial port"""
+    if ser:
+        port_name = ser.ser.port
+        ser.close()
+        print(f"Closed {port_name}")
+
+def _check_reply(response, motor_id, min_len):
+    """Return (ok, response) for a reply expected from motor_id"""
+    if not response:
+        return False, None
+    ok = len(response) >= min_len and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id
+    return ok, response
+
+def write_byte(ser, motor_id, address, value):
+    """Write a single byte to a motor register using direct serial"""
+    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 ... CHECKSUM
+    # For write (INST=0x03): ADDRESS VALUE
+    packet = _pack_packet(_WRITE_BUF, _WRITE_BYTE_FMT, motor_id, 0x04, INST_WRITE, address, value)
+    return _check_reply(ser.transact(packet, STATUS_PACKET_LEN), motor_id, STATUS_PACKET_LEN)
+
+def write_word(ser, motor_id, address, value):
+    """Write a two-byte word to a motor register using direct serial"""
+    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 PARAM3 CHECKSUM
+    # For write (INST=0x03): ADDRESS VALUE_L VALUE_H
+    packet = _pack_packet(_WRITE_BUF, _WRITE_WORD_FMT, motor_id, 0x05, INST_WRITE, address, value & 0xFFFF)
+    return _check_reply(ser.transact(packet, STATUS_PACKET_LEN), motor_id, STATUS_PACKET_LEN)
+
+def read_byte(ser, motor_id, address):
+    """Read a single byte from a motor register using direct serial"""
+    packet = _pack_packet(_READ_BUF, _READ_FMT, motor_id, 0x04, INST_READ, address, 1)
+
+    success, response = _check_reply(
+        ser.transact(packet, STATUS_PACKET_LEN + 1), motor_id, STATUS_PACKET_LEN + 1
+    )
+    if success:
+        return response[5], True, response
+    return 0, False, response
+
+def read_word(ser, motor_id, address, length=2):
+    """Read a two-byte word from a motor register using direct serial"""
+    # Format: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 CHECKSUM
+    # For read (INST=0x02): ADDRESS LENGTH
+    packet = _pack_packet(_READ_BUF, _READ_FMT, motor_id, 0x04, INST_READ, address, length)
+
+    success, response = _check_reply(
+        ser.transact(packet, STATUS_PACKET_LEN + length), motor_id, STATUS_PACKET_LEN + 2
+    )
+    if success:
+        # Extract value (little-endian)
+        value = int.from_bytes(response[5:7], "little")
+        return value, True, response
+    return 0, False, response
+
+def broadcast_write_byte(ser, address, value):
+    """Write a single byte to the same register on every motor (broadcast writes get no reply)"""
+    ser.transact(build_packet(bytes((BROADCAST_ID, 0x04, INST_WRITE, address, value))), 0)
+
+def sync_write(ser, motor_ids, address, data_len, values):
+    """Write one value per motor to the same register in a single SYNC WRITE packet (no reply)"""
+    params = b"".join(
+        bytes((motor_id,)) + value.to_bytes(data_len, "little") for motor_id, value in zip(motor_ids, values)
+    )
+    payload = bytes((BROADCAST_ID, len(params) + 4, INST_SYNC_WRITE, address, data_len)) + params
+    ser.transact(build_packet(payload), 0)
+
+def sync_write_byte(ser, motor_ids, address, values):
+    """SYNC WRITE a single-byte register on several motors"""
+    sync_write(ser, motor_ids, address, 1, values)
+
+def sync_write_word(ser, motor_ids, address, values):
+    """SYNC WRITE a two-byte register on several motors"""
+    sync_write(ser, motor_ids, address, 2, [value & 0xFFFF for value in values])
+
+def sync_read(ser, motor_ids, address, data_len):
+    """Read the same register from several motors with one SYNC READ; returns {motor_id: value}"""
+    payload = bytes((BROADCAST_ID, len(motor_ids) + 4, INST_SYNC_READ, address, data_len)) + bytes(motor_ids)
+    raw = ser.transact(build_packet(payload), (STATUS_PACKET_LEN + data_len) * len(motor_ids))
+    packets = parse_status_packets(raw)
+    return {
+        motor_id: int.from_bytes(packets[motor_id][5:5 + data_len], "little")
+        for motor_id in motor_ids
+        if motor_id in packets and len(packets[motor_id]) == STATUS_PACKET_LEN + data_len
+    }
+
+def sync_read_word(ser, motor_ids, address):
+    """SYNC READ a two-byte register from several motors"""
+    return sync_read(ser, motor_ids, address, 2)
+
+def ping_motor(ser, motor_id):
+    """Ping a motor to check if it's responsive"""
+    print(f"Pinging motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')})...")
+
+    # Basic ping packet: 0xFF 0xFF ID 0x02 0x01 CHECKSUM
+    packet = build_packet(bytes((motor_id, 0x02, INST_PING)))
+
+    response = ser.transact(packet, STATUS_PACKET_LEN)
+    if response:
+        print(f"  Response: {' '.join([hex(b) for b in response])}")
+
+        if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
+            print(f"  ✓ Motor {motor_id} responded to ping!")
+            return True
+        else:
+            print(f"  ✗ Invalid response format")
+            return False
+    else:
+        print(f"  ✗ No response from motor {motor_id}")
+        return False
+
+def ping_all(ser, motor_ids=MOTOR_IDS):
+    """Ping every motor with one broadcast ping, falling back to per-ID pings if nobody answers"""
+    print(f"Broadcast pinging motors {motor_ids}...")
+
+    # Motors reply in staggered slots after the broadcast; the read stops once all have answered
+    raw = ser.transact(build_packet(bytes((BROADCAST_ID, 0x02, INST_PING))), STATUS_PACKET_LEN * len(motor_ids))
+    if raw:
+        print(f"  Response: {' '.join([hex(b) for b in raw])}")
+
+    responsive_motors = [motor_id for motor_id in motor_ids if motor_id in parse_status_packets(raw)]
+    if responsive_motors:
+        for motor_id in responsive_motors:
+            print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) responded to ping!")
+        return responsive_motors
+
+    print("  ✗ No broadcast responses, pinging motors individually")
+    return [motor_id for motor_id in motor_ids if ping_motor(ser, motor_id)]
+
+def wait_moved(ser, motor_ids, timeout=MOVE_TIMEOUT):
+    """Poll the MOVING flag of the motors with exponential backoff until all have settled"""
+    pending = set(motor_ids)
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while pending and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.1)
+        moving = sync_read(ser, sorted(pending), ADDR_MOVING, 1)
+        pending -= {motor_id for motor_id, flag in moving.items() if flag == 0}
+    return not pending
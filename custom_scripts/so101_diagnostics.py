@@ -5,17 +5,22 @@ This script will help diagnose issues with the teleoperation between leader and
 It performs individual tests on:
 1. Leader arm motor response
 2. Follower arm motor response
-3. Ability to write positions to follower
+3. Ability to write positions to follower, all motors at once
 4. Monitoring changes in leader position
 
 Usage:
     python so101_diagnostics.py
 """
 
+import collections
 import sys
 import os
+import threading
 import time
 import signal
+from contextlib import contextmanager
+
+import numpy as np
 
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -27,64 +32,89 @@ except ImportError:
     print("Failed to import scservo_sdk. Make sure it's installed.")
     sys.exit(1)
 
+from bus import BAUDRATE, close_bus, get_bus, sync_write, wait_until_stopped
+
 # Port settings
 LEADER_PORT = "COM3"
 FOLLOWER_PORT = "COM4"
-BAUDRATE = 1000000
-PROTOCOL = 0  # Protocol 0 for SCServo SCS
 
 # Control parameters
 MOTOR_IDS = list(range(1, 7))  # Motors 1-6
 CENTER_POSITION = 2048  # Center position (0 degree)
+ADDR_PRESENT_POSITION = 56  # Present position
+
+POLL_INTERVAL = 0.01  # Pause between the background poller's sync reads, leaving the bus room to breathe
+SAMPLE_INTERVAL = 0.05  # How often the monitoring loop looks at the newest positions; costs no bus traffic
 
 def signal_handler(sig, frame):
     print("\nExiting program...")
     sys.exit(0)
 
-def test_ports():
-    """Test port connections"""
-    print("\n=== Testing Port Connections ===")
+def position_reader(port, packet):
+    """Build a GroupSyncRead of every motor's present position, reusable for any number of reads"""
+    group = scs.GroupSyncRead(port, packet, ADDR_PRESENT_POSITION, 2)
+    for motor_id in MOTOR_IDS:
+        group.addParam(motor_id)
+    return group
+
+def read_positions(group):
+    """Read all positions with one SYNC READ; returns {motor_id: position} for the motors that answered"""
+    if group.txRxPacket() != scs.COMM_SUCCESS:
+        return {}
+    # Called every monitoring tick, so the group's methods are bound once per read, not per motor
+    get_data, is_available = group.getData, group.isAvailable
+    return {
+        motor_id: get_data(motor_id, ADDR_PRESENT_POSITION, 2)
+        for motor_id in MOTOR_IDS
+        if is_available(motor_id, ADDR_PRESENT_POSITION, 2)
+    }
+
+class PositionPoller(threading.Thread):
+    """Thread that keeps sync-reading every motor's position while the main thread monitors them
+
+    Only the latest {motor_id: position} reading is kept, so the main thread never waits on the
+    serial port itself.
+    """
+
+    def __init__(self, group):
+        super().__init__(daemon=True)
+        self.group = group
+        self.latest = collections.deque(maxlen=1)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.latest.append(read_positions(self.group))
+            self.stop_event.wait(POLL_INTERVAL)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+@contextmanager
+def opened_port(port_name, label):
+    """Open a port through get_bus for the whole diagnostics run
+
+    Yields (port, packet) handlers, or None if the port can't be used, and closes the port on exit.
+    Opening once keeps the driver from re-initializing, and resetting the latency timer, per test.
+    """
+    try:
+        bus = get_bus(port_name)
+    except ConnectionError as e:
+        print(f"✗ {label.capitalize()} port: {e}")
+        yield None
+        return
 
-    # Test leader port
-    leader_port = scs.PortHandler(LEADER_PORT)
-    if leader_port.openPort():
-        print(f"✓ Successfully opened leader port {LEADER_PORT}")
-        if leader_port.setBaudRate(BAUDRATE):
-            print(f"✓ Changed leader baudrate to {BAUDRATE}")
-        else:
-            print(f"✗ Failed to change leader baudrate")
-        leader_port.closePort()
-    else:
-        print(f"✗ Failed to open leader port {LEADER_PORT}")
-
-    # Test follower port
-    follower_port = scs.PortHandler(FOLLOWER_PORT)
-    if follower_port.openPort():
-        print(f"✓ Successfully opened follower port {FOLLOWER_PORT}")
-        if follower_port.setBaudRate(BAUDRATE):
-            print(f"✓ Changed follower baudrate to {BAUDRATE}")
-        else:
-            print(f"✗ Failed to change follower baudrate")
-        follower_port.closePort()
-    else:
-        print(f"✗ Failed to open follower port {FOLLOWER_PORT}")
+    print(f"✓ Opened {label} port {port_name} at {BAUDRATE} baud")
+    try:
+        yield bus
+    finally:
+        close_bus(port_name)
 
-def test_leader_motors():
+def test_leader_motors(leader_port, leader_packet):
     """Test leader arm motors"""
     print("\n=== Testing Leader Arm Motors ===")
 
-    leader_port = scs.PortHandler(LEADER_PORT)
-    leader_packet = scs.PacketHandler(PROTOCOL)
-
-    if not leader_port.openPort():
-        print(f"✗ Failed to open leader port {LEADER_PORT}")
-        return
-
-    if not leader_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to change leader baudrate")
-        leader_port.closePort()
-        return
-
     # Test each motor
     for motor_id in MOTOR_IDS:
         # Try to read present position
@@ -104,24 +134,10 @@ def test_leader_motors():
         else:
             print(f"✗ Motor {motor_id} did not respond: {leader_packet.getTxRxResult(result)}")
 
-    leader_port.closePort()
-
-def test_follower_motors():
+def test_follower_motors(follower_port, follower_packet):
     """Test follower arm motors"""
     print("\n=== Testing Follower Arm Motors ===")
 
-    follower_port = scs.PortHandler(FOLLOWER_PORT)
-    follower_packet = scs.PacketHandler(PROTOCOL)
-
-    if not follower_port.openPort():
-        print(f"✗ Failed to open follower port {FOLLOWER_PORT}")
-        return
-
-    if not follower_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to change follower baudrate")
-        follower_port.closePort()
-        return
-
     # Test each motor
     for motor_id in MOTOR_IDS:
         # Try to read present position
@@ -141,116 +157,101 @@ def test_follower_motors():
         else:
             print(f"✗ Motor {motor_id} did not respond: {follower_packet.getTxRxResult(result)}")
 
-    follower_port.closePort()
-
-def test_follower_movement():
-    """Test follower arm movement"""
+def test_follower_movement(follower_port, follower_packet):
+    """Test follower arm movement, moving all motors at once"""
     print("\n=== Testing Follower Arm Movement ===")
 
-    follower_port = scs.PortHandler(FOLLOWER_PORT)
-    follower_packet = scs.PacketHandler(PROTOCOL)
-
-    if not follower_port.openPort():
-        print(f"✗ Failed to open follower port {FOLLOWER_PORT}")
+    # Read current positions first
+    current = read_positions(position_reader(follower_port, follower_packet))
+    for motor_id in MOTOR_IDS:
+        if motor_id not in current:
+            print(f"✗ Failed to read position from motor {motor_id}")
+    if not current:
         return
+    motor_ids = list(current)
 
-    if not follower_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to change follower baudrate")
-        follower_port.closePort()
+    # Enable torque
+    print(f"Enabling torque for motors {motor_ids}...")
+    if sync_write(follower_port, follower_packet, 50, 1, {motor_id: 1 for motor_id in motor_ids}) != scs.COMM_SUCCESS:
+        print("✗ Failed to enable torque")
         return
 
-    # Test each motor with a small movement
-    for motor_id in MOTOR_IDS:
-        # Read current position first
-        current_pos, result, error = follower_packet.read2ByteTxRx(follower_port, motor_id, 56)
-        if result != scs.COMM_SUCCESS:
-            print(f"✗ Failed to read position from motor {motor_id}")
-            continue
-
-        # Enable torque
-        print(f"Enabling torque for motor {motor_id}...")
-        torque_result, _ = follower_packet.write1ByteTxRx(follower_port, motor_id, 50, 1)
-        if torque_result != scs.COMM_SUCCESS:
-            print(f"✗ Failed to enable torque on motor {motor_id}")
-            continue
-
-        # Set goal position to current + small offset (if safe)
-        target_pos = min(max(current_pos + 50, 0), 4095)  # Stay within safe limits
-        print(f"Moving motor {motor_id} from {current_pos} to {target_pos}...")
-
-        move_result, _ = follower_packet.write2ByteTxRx(follower_port, motor_id, 60, target_pos)
-        if move_result != scs.COMM_SUCCESS:
-            print(f"✗ Failed to write position to motor {motor_id}")
-        else:
-            print(f"✓ Command sent to motor {motor_id}")
-
-            # Wait for movement
-            time.sleep(1)
-
-            # Read new position
-            new_pos, read_result, _ = follower_packet.read2ByteTxRx(follower_port, motor_id, 56)
-            if read_result == scs.COMM_SUCCESS:
-                difference = abs(new_pos - target_pos)
-                if difference < 20:
-                    print(f"✓ Motor {motor_id} moved to {new_pos} (target: {target_pos})")
-                else:
-                    print(f"✗ Motor {motor_id} moved to {new_pos}, but is off target by {difference}")
-            else:
-                print(f"✗ Failed to read new position from motor {motor_id}")
+    # Set goal positions to current + small offset (if safe)
+    targets = {motor_id: min(max(pos + 50, 0), 4095) for motor_id, pos in current.items()}  # Stay within safe limits
+    for motor_id, target_pos in targets.items():
+        print(f"Moving motor {motor_id} from {current[motor_id]} to {target_pos}...")
+
+    if sync_write(follower_port, follower_packet, 60, 2, targets) != scs.COMM_SUCCESS:
+        print("✗ Failed to write positions")
+    else:
+        print("✓ Command sent to all motors")
 
-        # Return to original position
-        follower_packet.write2ByteTxRx(follower_port, motor_id, 60, current_pos)
-        time.sleep(1)
+        # Wait for movement
+        wait_until_stopped(follower_port, follower_packet, motor_ids)
 
-        # Disable torque
-        follower_packet.write1ByteTxRx(follower_port, motor_id, 50, 0)
+        # Read new positions
+        new_positions = read_positions(position_reader(follower_port, follower_packet))
+        for motor_id, target_pos in targets.items():
+            new_pos = new_positions.get(motor_id)
+            if new_pos is None:
+                print(f"✗ Failed to read new position from motor {motor_id}")
+                continue
+            difference = abs(new_pos - target_pos)
+            if difference < 20:
+                print(f"✓ Motor {motor_id} moved to {new_pos} (target: {target_pos})")
+            else:
+                print(f"✗ Motor {motor_id} moved to {new_pos}, but is off target by {difference}")
 
-    follower_port.closePort()
+    # Return to original positions
+    sync_write(follower_port, follower_packet, 60, 2, current)
+    wait_until_stopped(follower_port, follower_packet, motor_ids)
 
-def monitor_leader_positions():
+    # Disable torque
+    sync_write(follower_port, follower_packet, 50, 1, {motor_id: 0 for motor_id in motor_ids})
+
+def monitor_leader_positions(leader_port, leader_packet):
     """Monitor leader arm positions for a few seconds to check if they change when moved manually"""
     print("\n=== Monitoring Leader Arm Positions ===")
     print("Please move the leader arm physically during the next 10 seconds...")
 
-    leader_port = scs.PortHandler(LEADER_PORT)
-    leader_packet = scs.PacketHandler(PROTOCOL)
+    # One sync read covers every motor, and the same group is reused for the whole monitoring window
+    positions_group = position_reader(leader_port, leader_packet)
 
-    if not leader_port.openPort():
-        print(f"✗ Failed to open leader port {LEADER_PORT}")
-        return
-
-    if not leader_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to change leader baudrate")
-        leader_port.closePort()
-        return
-
-    # First reading of positions
-    initial_positions = []
+    # First reading of positions; motors that didn't answer are left out of the change detection
+    positions = read_positions(positions_group)
+    initial = np.array([positions.get(motor_id, 0) for motor_id in MOTOR_IDS], dtype=np.int32)
+    has_initial = np.array([motor_id in positions for motor_id in MOTOR_IDS])
     for motor_id in MOTOR_IDS:
-        position, result, _ = leader_packet.read2ByteTxRx(leader_port, motor_id, 56)
-        if result == scs.COMM_SUCCESS:
-            initial_positions.append(position)
-        else:
-            initial_positions.append(None)
+        if motor_id not in positions:
             print(f"✗ Could not read initial position of motor {motor_id}")
 
-    print(f"Initial positions: {initial_positions}")
+    print(f"Initial positions: {[positions.get(motor_id) for motor_id in MOTOR_IDS]}")
     print("Move the leader arm now...")
 
-    # Monitor for changes
-    changed_motors = [False] * len(MOTOR_IDS)
+    # Monitor for changes, with the positions read on a background thread
+    changed_motors = np.zeros(len(MOTOR_IDS), dtype=bool)
+    latest = np.zeros(len(MOTOR_IDS), dtype=np.int32)
+    poller = PositionPoller(positions_group)
+    poller.start()
     start_time = time.time()
 
-    while time.time() - start_time < 10:  # Monitor for 10 seconds
-        for i, motor_id in enumerate(MOTOR_IDS):
-            position, result, _ = leader_packet.read2ByteTxRx(leader_port, motor_id, 56)
-            if result == scs.COMM_SUCCESS:
-                if initial_positions[i] is not None and abs(position - initial_positions[i]) > 10:
-                    changed_motors[i] = True
+    try:
+        while time.time() - start_time < 10:  # Monitor for 10 seconds
+            time.sleep(SAMPLE_INTERVAL)
+
+            # Take the newest reading; none means the poller hasn't finished one since the last check
+            try:
+                positions = poller.latest.pop()
+            except IndexError:
+                continue
+            latest[:] = [positions.get(motor_id, 0) for motor_id in MOTOR_IDS]
+            answered = np.array([motor_id in positions for motor_id in MOTOR_IDS])
+            changed_motors |= has_initial & answered & (np.abs(latest - initial) > 10)
 
-        # Print progress
-        print(f"Monitoring: {'.' * int((time.time() - start_time))} {int(time.time() - start_time)}s", end="\r")
-        time.sleep(0.2)
+            # Print progress
+            print(f"Monitoring: {'.' * int((time.time() - start_time))} {int(time.time() - start_time)}s", end="\r")
+    finally:
+        poller.stop()
 
     print("\nMonitoring complete!")
 
@@ -260,29 +261,25 @@ def monitor_leader_positions():
         status = "✓ Changed" if changed_motors[i] else "✗ No change detected"
         print(f"Motor {motor_id}: {status}")
 
-    leader_port.closePort()
-
-def check_teleoperation_prerequisites():
-    """Check all prerequisites for teleoperation"""
+def check_teleoperation_prerequisites(leader, follower):
+    """Check all prerequisites for teleoperation, given the (port, packet) handlers of each open port"""
     print("\n=== Checking Teleoperation Prerequisites ===")
 
-    # Check leader arm
-    leader_port = scs.PortHandler(LEADER_PORT)
-    leader_packet = scs.PacketHandler(PROTOCOL)
-
-    if not leader_port.openPort():
+    # Check that both ports are available
+    if leader is None:
         print(f"✗ Leader port {LEADER_PORT} not available")
         return False
-
-    if not leader_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to set leader baudrate")
-        leader_port.closePort()
+    if follower is None:
+        print(f"✗ Follower port {FOLLOWER_PORT} not available")
         return False
+    leader_port, leader_packet = leader
+    follower_port, follower_packet = follower
 
+    # Check leader arm
     leader_motors_working = True
+    positions = read_positions(position_reader(leader_port, leader_packet))
     for motor_id in MOTOR_IDS:
-        _, result, _ = leader_packet.read2ByteTxRx(leader_port, motor_id, 56)
-        if result != scs.COMM_SUCCESS:
+        if motor_id not in positions:
             leader_motors_working = False
             print(f"✗ Leader motor {motor_id} not responding")
 
@@ -290,24 +287,10 @@ def check_teleoperation_prerequisites():
         print(f"✓ All leader motors responding")
 
     # Check follower arm
-    follower_port = scs.PortHandler(FOLLOWER_PORT)
-    follower_packet = scs.PacketHandler(PROTOCOL)
-
-    if not follower_port.openPort():
-        print(f"✗ Follower port {FOLLOWER_PORT} not available")
-        leader_port.closePort()
-        return False
-
-    if not follower_port.setBaudRate(BAUDRATE):
-        print(f"✗ Failed to set follower baudrate")
-        leader_port.closePort()
-        follower_port.closePort()
-        return False
-
     follower_motors_working = True
+    positions = read_positions(position_reader(follower_port, follower_packet))
     for motor_id in MOTOR_IDS:
-        _, result, _ = follower_packet.read2ByteTxRx(follower_port, motor_id, 56)
-        if result != scs.COMM_SUCCESS:
+        if motor_id not in positions:
             follower_motors_working = False
             print(f"✗ Follower motor {motor_id} not responding")
 
@@ -329,9 +312,6 @@ def check_teleoperation_prerequisites():
     if torque_working:
         print(f"✓ Torque control working on all follower motors")
 
-    leader_port.closePort()
-    follower_port.closePort()
-
     all_good = leader_motors_working and follower_motors_working and torque_working
     if all_good:
         print("\n✓ All prerequisites for teleoperation met!")
@@ -347,13 +327,18 @@ def main():
     print("=== SO-101 Diagnostics Tool ===\n")
     print("Running comprehensive diagnostics on both leader and follower arms...")
 
-    # Run diagnostic tests
-    test_ports()
-    test_leader_motors()
-    test_follower_motors()
-    test_follower_movement()
-    monitor_leader_positions()
-    check_teleoperation_prerequisites()
+    # Open both ports once for the whole run
+    print("\n=== Testing Port Connections ===")
+    with opened_port(LEADER_PORT, "leader") as leader, opened_port(FOLLOWER_PORT, "follower") as follower:
+        # Run diagnostic tests, skipping those whose port couldn't be opened
+        if leader:
+            test_leader_motors(*leader)
+        if follower:
+            test_follower_motors(*follower)
+            test_follower_movement(*follower)
+        if leader:
+            monitor_leader_positions(*leader)
+        check_teleoperation_prerequisites(leader, follower)
 
     print("\nDiagnostic tests complete!")
 
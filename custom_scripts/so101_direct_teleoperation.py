@@ -11,14 +11,20 @@ Usage:
     python so101_direct_teleoperation.py
 """
 
+import _thread
+import itertools
+import struct
 import sys
 import os
 import time
 import signal
 import keyboard  # pip install keyboard
+import queue
 import threading
 import serial
 
+import numpy as np
+
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -29,6 +35,24 @@ except ImportError:
     print("Failed to import scservo_sdk. Make sure it's installed.")
     sys.exit(1)
 
+from scs_protocol import (
+    ADDR_GOAL_POSITION,
+    ADDR_PRESENT_POSITION,
+    ADDR_TORQUE_ENABLE,
+    BROADCAST_ID,
+    INST_PING,
+    INST_READ,
+    INST_SYNC_READ,
+    INST_SYNC_WRITE,
+    INST_WRITE,
+    STATUS_PACKET_LEN,
+    build_packet,
+    parse_status_packets,
+    set_async_low_latency,
+    set_low_latency,
+    set_port_low_latency,
+)
+
 # Port settings
 LEADER_PORT = "COM3"
 FOLLOWER_PORT = "COM4"
@@ -37,6 +61,10 @@ PROTOCOL = 0  # Protocol 0 for SCServo SCS
 
 # Control parameters
 UPDATE_FREQUENCY = 0.05  # seconds
+REPLY_TIMEOUT = 0.02  # Upper bound on waiting for a direct-mode status packet (seconds)
+STATUS_INTERVAL_TICKS = 10  # Main-loop ticks between status line updates
+DRAIN_INTERVAL_TICKS = 100  # Main-loop ticks between discarding whatever the follower port has received
+LEADER_POLL_INTERVAL = 0.005  # Pause between the leader reader's reads, leaving the GIL to the main loop
 MOTOR_IDS = list(range(1, 7))  # Motors 1-6
 DEBUG_MODE = False
 DIRECT_MODE = True  # Use direct serial commands instead of SDK
@@ -58,17 +86,40 @@ leader_packet_handler = scs.PacketHandler(PROTOCOL)
 follower_port_handler = scs.PortHandler(FOLLOWER_PORT)
 follower_packet_handler = scs.PacketHandler(PROTOCOL)
 teleoperation_active = True
-position_offsets = [0, 0, 0, 0, 0, 0]  # Offsets between leader and follower
+shutdown_done = False
+position_offsets = np.zeros(len(MOTOR_IDS), dtype=np.int32)  # Offsets between leader and follower
 leader_serial = None
 follower_serial = None
 lock = threading.Lock()
+leader_lock = threading.Lock()  # Held for a whole leader read, so its positions buffer isn't refilled mid-copy
+# Held while the goal-position packet is patched and written, and across every request/reply pair on
+# the follower port, so FollowerWriter and the main loop's drain can't cut into a keyboard action's reply
+follower_lock = threading.Lock()
+shutdown_lock = threading.Lock()  # Guards shutdown_done, so the motors are disabled and the ports closed once
+
+# read_leader_positions fills this buffer in place on every call instead of building a new list
+leader_positions_buffer = np.full(len(MOTOR_IDS), CENTER_POSITION, dtype=np.int32)
+
+# SYNC READ of every leader motor's present position: 0xFF 0xFF 0xFE LENGTH 0x82 0x38 0x02 ID... CHECKSUM
+LEADER_POSITIONS_READ = build_packet(
+    bytes((BROADCAST_ID, len(MOTOR_IDS) + 4, INST_SYNC_READ, ADDR_PRESENT_POSITION, 2)) + bytes(MOTOR_IDS)
+)
+LEADER_POSITIONS_REPLY_LEN = (STATUS_PACKET_LEN + 2) * len(MOTOR_IDS)  # One 8-byte status packet per motor
 
 def signal_handler(sig, frame):
-    """Clean up on exit"""
+    """Unwind to main's cleanup, which stops the port threads before shutting down"""
     print("\nExiting program...")
+    raise KeyboardInterrupt
+
+def shutdown():
+    """Disable the follower motors and close the ports, only the first time any exit path asks"""
+    global shutdown_done
+    with shutdown_lock:
+        if shutdown_done:
+            return
+        shutdown_done = True
     disable_all_motors()
     close_ports()
-    sys.exit(0)
 
 def close_ports():
     """Close all ports"""
@@ -106,6 +157,8 @@ def open_ports():
             
             if leader_port_handler.setBaudRate(BAUDRATE):
                 print(f"✓ Changed leader baudrate to {BAUDRATE}")
+                # setBaudRate reopens the port, so its latency is lowered afterwards
+                set_port_low_latency(leader_port_handler)
             else:
                 print(f"✗ Failed to change leader baudrate")
                 leader_port_handler.closePort()
@@ -124,6 +177,7 @@ def open_ports():
             
             if follower_port_handler.setBaudRate(BAUDRATE):
                 print(f"✓ Changed follower baudrate to {BAUDRATE}")
+                set_port_low_latency(follower_port_handler)
             else:
                 print(f"✗ Failed to change follower baudrate")
                 follower_port_handler.closePort()
@@ -136,9 +190,17 @@ def open_ports():
         try:
             # We'll only use direct serial communication
             print("Using direct serial mode...")
-            leader_serial = serial.Serial(LEADER_PORT, BAUDRATE, timeout=0.1)
+            # Without this every reply waits out the adapter's 16 ms latency timer. Ports that
+            # aren't FTDI adapters, or lack the rights to change it, are left as they are.
+            set_low_latency(LEADER_PORT)
+            set_low_latency(FOLLOWER_PORT)
+            # A read returns as soon as the bytes it asked for are in, so the timeout only bounds
+            # how long a reply with missing bytes can stall a tick
+            leader_serial = serial.Serial(LEADER_PORT, BAUDRATE, timeout=REPLY_TIMEOUT)
+            set_async_low_latency(leader_serial)
             print(f"✓ Successfully opened direct leader serial port")
-            follower_serial = serial.Serial(FOLLOWER_PORT, BAUDRATE, timeout=0.1)
+            follower_serial = serial.Serial(FOLLOWER_PORT, BAUDRATE, timeout=REPLY_TIMEOUT)
+            set_async_low_latency(follower_serial)
             print(f"✓ Successfully opened direct follower serial port")
         except Exception as e:
             print(f"✗ Error opening direct serial ports: {e}")
@@ -149,56 +211,131 @@ def open_ports():
 
     return success
 
+# struct codes of one SYNC WRITE parameter block, by data length: the ID, then the value little-endian
+SYNC_WRITE_PARAM_CODES = {1: "BB", 2: "BH"}
+
+def sync_write_packet(address, data_len, values, motor_ids=MOTOR_IDS):
+    """Build one SYNC WRITE packet setting a register on the follower motors, all of them by default
+
+    The packet goes to the broadcast ID, so no motor replies and nothing needs to be read back.
+    """
+    params = struct.pack(
+        "<" + SYNC_WRITE_PARAM_CODES[data_len] * len(motor_ids),
+        *itertools.chain.from_iterable(zip(motor_ids, map(int, values))),
+    )
+    return build_packet(bytes((BROADCAST_ID, len(params) + 4, INST_SYNC_WRITE, address, data_len)) + params)
+
+# Command packets that never change, built once at import instead of on every call
+TORQUE_OFF_PACKET = sync_write_packet(ADDR_TORQUE_ENABLE, 1, [0] * len(MOTOR_IDS))
+TORQUE_ON_PACKET = sync_write_packet(ADDR_TORQUE_ENABLE, 1, [1] * len(MOTOR_IDS))
+PING_PACKETS = {motor_id: build_packet(bytes((motor_id, 0x02, INST_PING))) for motor_id in MOTOR_IDS}
+CENTER_GOAL_PACKETS = {
+    motor_id: build_packet(bytes((motor_id, 0x05, INST_WRITE, ADDR_GOAL_POSITION)) + CENTER_POSITION.to_bytes(2, "little"))
+    for motor_id in MOTOR_IDS
+}
+POSITION_READ_PACKETS = {
+    motor_id: build_packet(bytes((motor_id, 0x04, INST_READ, ADDR_PRESENT_POSITION, 0x02))) for motor_id in MOTOR_IDS
+}
+
+# Goal-position SYNC WRITE reused by every set_follower_positions call; only each motor's POS_L and
+# POS_H (at GOAL_POSITION_OFFSETS) and the trailing checksum are patched in place
+GOAL_POSITIONS_PACKET = bytearray(sync_write_packet(ADDR_GOAL_POSITION, 2, [0] * len(MOTOR_IDS)))
+GOAL_POSITION_OFFSETS = tuple(8 + 3 * i for i in range(len(MOTOR_IDS)))  # Header, 5 fixed bytes, then (ID POS_L POS_H)...
+# Checksum sum over the packet's bytes that never change (its position bytes start out zero)
+GOAL_POSITIONS_FIXED_SUM = sum(GOAL_POSITIONS_PACKET[2:-1])
+# NumPy views straight onto the packet's position fields, as little-endian words and as bytes, so
+# patching them and summing them for the checksum are single C-level operations
+GOAL_POSITION_WORDS = np.ndarray(
+    (len(MOTOR_IDS),), dtype="<u2", buffer=GOAL_POSITIONS_PACKET, offset=GOAL_POSITION_OFFSETS[0], strides=(3,)
+)
+GOAL_POSITION_BYTES = np.ndarray(
+    (len(MOTOR_IDS), 2), dtype=np.uint8, buffer=GOAL_POSITIONS_PACKET, offset=GOAL_POSITION_OFFSETS[0], strides=(3, 1)
+)
+
+def wait_reply(ser, n, timeout=REPLY_TIMEOUT):
+    """Wait until n reply bytes are in or timeout expires, and return whatever has arrived
+
+    Returns as soon as the reply is complete instead of sleeping out its worst case.
+    """
+    end = time.perf_counter() + timeout
+    while ser.in_waiting < n and time.perf_counter() < end:
+        pass
+    return ser.read(ser.in_waiting)
+
 def disable_all_motors():
     """Disable torque for all follower motors"""
     print("Disabling torque for all motors...")
 
     if DIRECT_MODE and follower_serial:
-        # Direct mode using serial
-        for motor_id in MOTOR_IDS:
-            # Format for write1Byte: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 ... CHECKSUM
-            # Torque off: 0xFF 0xFF ID 0x04 0x03 0x28 0x00 CHECKSUM
-            # (0x28 = register 40 = Torque Enable, 0x00 = value to write)
-            checksum = 0xFF - ((motor_id + 0x04 + 0x03 + 0x28 + 0x00) % 256)
-            command = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x03, 0x28, 0x00, checksum])
-            try:
-                follower_serial.write(command)
-                time.sleep(0.01)
-                follower_serial.read(follower_serial.in_waiting or 1)  # Clear buffer
-            except:
-                pass  # Ignore errors during shutdown
+        # Direct mode using serial: one SYNC WRITE of 0 to Torque Enable (0x28) on every motor
+        try:
+            with follower_lock:
+                follower_serial.write(TORQUE_OFF_PACKET)
+        except:
+            pass  # Ignore errors during shutdown
     else:
-        # SDK mode
+        # SDK mode: one sync write of 0 to Torque Enable (address 40) on every motor
         try:
+            group = scs.GroupSyncWrite(follower_port_handler, follower_packet_handler, 40, 1)
             for motor_id in MOTOR_IDS:
-                follower_packet_handler.write1ByteTxRx(follower_port_handler, motor_id, 40, 0)
+                group.addParam(motor_id, [0])
+            group.txPacket()
         except:
             pass  # Ignore errors during shutdown
 
 def read_leader_positions():
     """Read positions from leader arm"""
-    positions = []
+    positions = leader_positions_buffer
     errors = 0
 
-    for motor_id in MOTOR_IDS:
+    if DIRECT_MODE and leader_serial:
+        # Direct mode: one SYNC READ, answered by every motor's status packet back to back
+        try:
+            leader_serial.reset_input_buffer()
+            leader_serial.write(LEADER_POSITIONS_READ)
+            packets = parse_status_packets(leader_serial.read(LEADER_POSITIONS_REPLY_LEN))
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"Exception reading leader positions: {e}")
+            packets = {}
+
+        for i, motor_id in enumerate(MOTOR_IDS):
+            packet = packets.get(motor_id)
+            if packet is not None and len(packet) == STATUS_PACKET_LEN + 2:
+                position = int.from_bytes(packet[5:7], "little")
+                positions[i] = position
+                if DEBUG_MODE:
+                    print(f"Read leader motor {motor_id}: {position}")
+            else:
+                if DEBUG_MODE:
+                    print(f"Failed to read position from leader motor {motor_id}")
+                positions[i] = CENTER_POSITION  # Use center position as fallback
+                errors += 1
+
+        if errors > 0 and DEBUG_MODE:
+            print(f"Warning: {errors}/{len(MOTOR_IDS)} leader motor reads failed")
+
+        return positions
+
+    for i, motor_id in enumerate(MOTOR_IDS):
         try:
             position, result, _ = leader_packet_handler.read2ByteTxRx(
                 leader_port_handler, motor_id, 56)  # Read present position (address 56)
 
             if result == scs.COMM_SUCCESS:
-                positions.append(position)
+                positions[i] = position
                 if DEBUG_MODE:
                     print(f"Read leader motor {motor_id}: {position}")
             else:
                 error_msg = leader_packet_handler.getTxRxResult(result)
                 if DEBUG_MODE:
                     print(f"Failed to read position from leader motor {motor_id}: {error_msg}")
-                positions.append(2048)  # Use center position as fallback
+                positions[i] = CENTER_POSITION  # Use center position as fallback
                 errors += 1
         except Exception as e:
             if DEBUG_MODE:
                 print(f"Exception reading leader motor {motor_id}: {e}")
-            positions.append(2048)
+            positions[i] = CENTER_POSITION
             errors += 1
 
     if errors > 0 and DEBUG_MODE:
@@ -206,40 +343,53 @@ def read_leader_positions():
 
     return positions
 
-def set_follower_positions(positions):
-    """Set positions for follower arm, with both direct mode and SDK as fallback"""
+def set_follower_positions(positions, changed=None):
+    """Set positions for follower arm, with both direct mode and SDK as fallback
+
+    If changed is given, a boolean mask over MOTOR_IDS, only those motors are sent their position.
+    """
     success_count = 0
+    if changed is None or changed.all():
+        motor_ids = MOTOR_IDS
+    else:
+        motor_ids = [motor_id for motor_id, motor_changed in zip(MOTOR_IDS, changed) if motor_changed]
+        positions = [position for position, motor_changed in zip(positions, changed) if motor_changed]
 
-    if DIRECT_MODE and follower_serial:
-        # Direct mode using serial
-        for motor_id, position in zip(MOTOR_IDS, positions):
-            # Format for write2Byte: 0xFF 0xFF ID LENGTH INSTRUCTION PARAM1 PARAM2 PARAM3 CHECKSUM
-            # Position write: 0xFF 0xFF ID 0x05 0x03 0x2A POS_L POS_H CHECKSUM
-            # (0x2A = register 42 = Goal Position, POS_L and POS_H are low and high bytes of position)
-            pos_l = position & 0xFF  # Low byte
-            pos_h = (position >> 8) & 0xFF  # High byte
-            checksum = 0xFF - ((motor_id + 0x05 + 0x03 + 0x2A + pos_l + pos_h) % 256)
-            command = bytearray([0xFF, 0xFF, motor_id, 0x05, 0x03, 0x2A, pos_l, pos_h, checksum])
+    if DIRECT_MODE and follower_serial and motor_ids is not MOTOR_IDS:
+        # Direct mode, some motors: a SYNC WRITE carrying just their goal positions
+        command = sync_write_packet(ADDR_GOAL_POSITION, 2, positions, motor_ids)
+        try:
+            if DEBUG_MODE:
+                print(f"Setting motors {motor_ids} to positions {[int(position) for position in positions]}")
+
+            with follower_lock:
+                follower_serial.write(command)
+            success_count = len(motor_ids)
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"Exception setting follower positions: {e}")
+    elif DIRECT_MODE and follower_serial:
+        # Direct mode using serial: all goal positions (0x2A = register 42) in one SYNC WRITE
+        # Format: 0xFF 0xFF 0xFE LENGTH 0x83 0x2A 0x02 (ID POS_L POS_H)... CHECKSUM
+        with follower_lock:
+            # The checksum only needs the position bytes added to the precomputed fixed part
+            command = GOAL_POSITIONS_PACKET
+            GOAL_POSITION_WORDS[:] = positions
+            command[-1] = (~(GOAL_POSITIONS_FIXED_SUM + int(GOAL_POSITION_BYTES.sum()))) & 0xFF
 
             try:
                 if DEBUG_MODE:
-                    print(f"Setting motor {motor_id} to position {position}")
-                    print(f"Command: {' '.join([hex(b) for b in command])}")
+                    print(f"Setting motors to positions {[int(position) for position in positions]}")
+                    print(f"Command: {command.hex(' ')}")
 
                 follower_serial.write(command)
-                time.sleep(0.01)  # Small delay between commands
-
-                # Clear buffer, but we don't need the response
-                if follower_serial.in_waiting:
-                    follower_serial.read(follower_serial.in_waiting)
-
-                success_count += 1
+                success_count = len(MOTOR_IDS)
             except Exception as e:
                 if DEBUG_MODE:
-                    print(f"Exception setting follower motor {motor_id}: {e}")
+                    print(f"Exception setting follower positions: {e}")
     else:
         # SDK mode as fallback
-        for motor_id, position in zip(MOTOR_IDS, positions):
+        for motor_id, position in zip(motor_ids, positions):
             try:
                 # Ensure position is within valid range
                 safe_position = max(0, min(4095, int(position)))
@@ -256,38 +406,90 @@ def set_follower_positions(positions):
                 if DEBUG_MODE:
                     print(f"Exception moving motor {motor_id}: {e}")
 
-    if DEBUG_MODE and success_count != len(MOTOR_IDS):
-        print(f"Only {success_count}/{len(MOTOR_IDS)} follower motors were successfully moved")
+    if DEBUG_MODE and success_count != len(motor_ids):
+        print(f"Only {success_count}/{len(motor_ids)} follower motors were successfully moved")
 
     return success_count
 
+class LeaderReader(threading.Thread):
+    """Thread that keeps reading the leader arm so the main loop never waits on the leader port
+
+    Only the newest positions are kept, so the main loop always works from the latest pose. They
+    live in one preallocated array that is copied in and out under a lock held just for the copy,
+    so no reading allocates.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.positions = np.empty(len(MOTOR_IDS), dtype=np.int32)
+        self.swap_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            with leader_lock:
+                positions = read_leader_positions()
+                with self.swap_lock:
+                    np.copyto(self.positions, positions)
+            self.ready.set()
+            self.stop_event.wait(LEADER_POLL_INTERVAL)
+
+    def latest(self, out):
+        """Copy the newest leader positions into out, waiting for the first reading if there is none yet"""
+        self.ready.wait()
+        with self.swap_lock:
+            np.copyto(out, self.positions)
+        return out
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+class FollowerWriter(threading.Thread):
+    """Thread that sends goal positions to the follower while the main loop computes the next ones
+
+    Positions still waiting when newer ones arrive are dropped, so the follower never replays a
+    stale pose. The motors each dropped request changed are still sent, with the newer positions.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.requests = queue.Queue()
+
+    def submit(self, positions, changed):
+        self.requests.put((positions, changed))
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            # Skip to the newest positions queued behind this one
+            while request is not None and not self.requests.empty():
+                newer = self.requests.get_nowait()
+                request = newer if newer is None else (newer[0], request[1] | newer[1])
+            if request is None:
+                break
+            set_follower_positions(*request)
+
+    def stop(self):
+        self.requests.put(None)
+        self.join()
+
 def enable_all_follower_motors():
     """Enable torque for all follower motors"""
     print("Enabling torque for all follower motors...")
     success_count = 0
 
     if DIRECT_MODE and follower_serial:
-        # Direct mode using serial
-        for motor_id in MOTOR_IDS:
-            # Torque on: 0xFF 0xFF ID 0x04 0x03 0x28 0x01 CHECKSUM
-            # (0x28 = register 40 = Torque Enable, 0x01 = value to write)
-            checksum = 0xFF - ((motor_id + 0x04 + 0x03 + 0x28 + 0x01) % 256)
-            command = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x03, 0x28, 0x01, checksum])
-
-            try:
-                follower_serial.write(command)
-                time.sleep(0.01)
-
-                # Check for response
-                if follower_serial.in_waiting:
-                    response = follower_serial.read(follower_serial.in_waiting)
-                    if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-                        success_count += 1
-                        if DEBUG_MODE:
-                            print(f"Successfully enabled torque on motor {motor_id}")
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f"Exception enabling motor {motor_id}: {e}")
+        # Direct mode using serial: one SYNC WRITE of 1 to Torque Enable (0x28) on every motor.
+        # Motors don't acknowledge it, so every motor counts as enabled once the packet is sent.
+        try:
+            with follower_lock:
+                follower_serial.write(TORQUE_ON_PACKET)
+            success_count = len(MOTOR_IDS)
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"Exception enabling follower motors: {e}")
     else:
         # SDK mode as fallback
         for motor_id in MOTOR_IDS:
@@ -308,6 +510,24 @@ def enable_all_follower_motors():
 
     return success_count
 
+def ping_direct(ser, motor_id):
+    """Ping a motor over a direct serial port, printing the outcome; returns whether it responded"""
+    try:
+        # Basic ping packet: 0xFF 0xFF ID 0x02 0x01 CHECKSUM
+        ser.reset_input_buffer()
+        ser.write(PING_PACKETS[motor_id])
+        response = wait_reply(ser, STATUS_PACKET_LEN)
+        if response:
+            if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
+                print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) responded")
+                return True
+            print(f"  ✗ Motor {motor_id} invalid response: {response.hex(' ')}")
+        else:
+            print(f"  ✗ Motor {motor_id} did not respond")
+    except Exception as e:
+        print(f"  ✗ Motor {motor_id}: Error {e}")
+    return False
+
 def ping_all_motors():
     """Ping all motors to check communication"""
     print("\n=== Testing Motor Communication ===")
@@ -315,16 +535,22 @@ def ping_all_motors():
     # Test leader motors
     print("Leader arm motors:")
     leader_success = 0
-    for motor_id in MOTOR_IDS:
-        try:
-            model_number, comm_result, error = leader_packet_handler.ping(leader_port_handler, motor_id)
-            if comm_result == scs.COMM_SUCCESS:
-                print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) responded")
-                leader_success += 1
-            else:
-                print(f"  ✗ Motor {motor_id} did not respond")
-        except Exception as e:
-            print(f"  ✗ Motor {motor_id}: Error {e}")
+
+    if DIRECT_MODE and leader_serial:
+        # Use direct serial for leader, holding its lock so the reader thread's requests don't interleave
+        with leader_lock:
+            leader_success = sum(ping_direct(leader_serial, motor_id) for motor_id in MOTOR_IDS)
+    else:
+        for motor_id in MOTOR_IDS:
+            try:
+                model_number, comm_result, error = leader_packet_handler.ping(leader_port_handler, motor_id)
+                if comm_result == scs.COMM_SUCCESS:
+                    print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) responded")
+                    leader_success += 1
+                else:
+                    print(f"  ✗ Motor {motor_id} did not respond")
+            except Exception as e:
+                print(f"  ✗ Motor {motor_id}: Error {e}")
 
     print(f"Leader arm: {leader_success}/{len(MOTOR_IDS)} motors responding")
 
@@ -333,27 +559,10 @@ def ping_all_motors():
     follower_success = 0
 
     if DIRECT_MODE and follower_serial:
-        # Use direct serial for follower
+        # Use direct serial for follower, taking the lock per ping so the writer thread isn't held up long
         for motor_id in MOTOR_IDS:
-            try:
-                # Basic ping packet: 0xFF 0xFF ID 0x02 0x01 CHECKSUM
-                checksum = 0xFF - ((motor_id + 0x02 + 0x01) % 256)
-                ping_packet = bytearray([0xFF, 0xFF, motor_id, 0x02, 0x01, checksum])
-
-                follower_serial.write(ping_packet)
-                time.sleep(0.1)  # Wait for response
-
-                if follower_serial.in_waiting:
-                    response = follower_serial.read(follower_serial.in_waiting)
-                    if len(response) >= 6 and response[0] == 0xFF and response[1] == 0xFF and response[2] == motor_id:
-                        print(f"  ✓ Motor {motor_id} ({MOTOR_NAMES.get(motor_id, 'Unknown')}) responded")
-                        follower_success += 1
-                    else:
-                        print(f"  ✗ Motor {motor_id} invalid response: {' '.join([hex(b) for b in response])}")
-                else:
-                    print(f"  ✗ Motor {motor_id} did not respond")
-            except Exception as e:
-                print(f"  ✗ Motor {motor_id}: Error {e}")
+            with follower_lock:
+                follower_success += ping_direct(follower_serial, motor_id)
     else:
         # Use SDK for follower
         for motor_id in MOTOR_IDS:
@@ -376,11 +585,12 @@ def calibrate_offset():
     global position_offsets
 
     # Read current leader positions
-    leader_positions = read_leader_positions()
+    with leader_lock:
+        leader_positions = read_leader_positions().copy()
 
     # Set offsets to move from current leader position to center position
     # This will make the follower start at center (2048)
-    position_offsets = [CENTER_POSITION - l for l in leader_positions]
+    position_offsets = CENTER_POSITION - leader_positions
 
     print("Calibrated offsets:")
     for i, offset in enumerate(position_offsets):
@@ -403,44 +613,39 @@ def test_follower_arm():
 
         # Move to center position
         if DIRECT_MODE and follower_serial:
-            # Direct mode
-            pos_l = CENTER_POSITION & 0xFF
-            pos_h = (CENTER_POSITION >> 8) & 0xFF
-            checksum = 0xFF - ((motor_id + 0x05 + 0x03 + 0x2A + pos_l + pos_h) % 256)
-            command = bytearray([0xFF, 0xFF, motor_id, 0x05, 0x03, 0x2A, pos_l, pos_h, checksum])
-
-            try:
-                follower_serial.write(command)
-                time.sleep(0.5)  # Allow time to move
-
-                # Now check position
-                # Read present position: 0xFF 0xFF ID 0x04 0x02 0x38 0x02 CHECKSUM
-                # (0x38 = register 56 = Present Position, 0x02 = number of bytes to read)
-                checksum = 0xFF - ((motor_id + 0x04 + 0x02 + 0x38 + 0x02) % 256)
-                read_cmd = bytearray([0xFF, 0xFF, motor_id, 0x04, 0x02, 0x38, 0x02, checksum])
-
-                follower_serial.write(read_cmd)
-                time.sleep(0.1)
-
-                if follower_serial.in_waiting:
-                    response = follower_serial.read(follower_serial.in_waiting)
-                    if len(response) >= 8:  # Status packet with position
-                        pos_low = response[5]
-                        pos_high = response[6]
-                        position = (pos_high << 8) + pos_low
-                        print(f"  Position: {position}")
-
-                        diff = abs(position - CENTER_POSITION)
-                        if diff < 50:
-                            print(f"  ✓ Motor responded correctly (within {diff} steps of target)")
+            # Direct mode. The lock is held for the whole move and check, so the teleoperation
+            # writer can neither move this motor elsewhere nor interleave with its reply.
+            with follower_lock:
+                try:
+                    follower_serial.write(CENTER_GOAL_PACKETS[motor_id])
+                    time.sleep(0.5)  # Allow time to move
+
+                    # Now check position, dropping the goal write's acknowledgement first so the reply
+                    # starts the buffer
+                    # Read present position: 0xFF 0xFF ID 0x04 0x02 0x38 0x02 CHECKSUM
+                    # (0x38 = register 56 = Present Position, 0x02 = number of bytes to read)
+                    follower_serial.reset_input_buffer()
+                    follower_serial.write(POSITION_READ_PACKETS[motor_id])
+
+                    response = wait_reply(follower_serial, STATUS_PACKET_LEN + 2)
+                    if response:
+                        if len(response) >= 8:  # Status packet with position
+                            pos_low = response[5]
+                            pos_high = response[6]
+                            position = (pos_high << 8) + pos_low
+                            print(f"  Position: {position}")
+
+                            diff = abs(position - CENTER_POSITION)
+                            if diff < 50:
+                                print(f"  ✓ Motor responded correctly (within {diff} steps of target)")
+                            else:
+                                print(f"  ✗ Motor position is off by {diff} steps")
                         else:
-                            print(f"  ✗ Motor position is off by {diff} steps")
+                            print(f"  ✗ Invalid position response: {response.hex(' ')}")
                     else:
-                        print(f"  ✗ Invalid position response: {' '.join([hex(b) for b in response])}")
-                else:
-                    print("  ✗ No response from motor")
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
+                        print("  ✗ No response from motor")
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
         else:
             # SDK mode
             try:
@@ -492,62 +697,90 @@ def print_instructions():
 def print_status(leader_positions, is_active):
     """Print current status"""
     status = "ACTIVE" if is_active else "PAUSED"
-    print(f"\rTeleoperation: {status} | ", end="")
 
     # Calculate positions that will be sent to follower
-    follower_targets = [(leader_pos + offset) % 4096 for leader_pos, offset in zip(leader_positions, position_offsets)]
+    follower_targets = (leader_positions + position_offsets) & 0xFFF
+
+    # The whole line goes out in one write; the extra space overwrites the end of the previous one
+    motors = "".join(
+        f"{motor_id}:{leader_pos}->{follower_pos} "
+        for motor_id, leader_pos, follower_pos in zip(MOTOR_IDS, leader_positions, follower_targets)
+    )
+    sys.stdout.write(f"\rTeleoperation: {status} | {motors} \r")
+    sys.stdout.flush()
 
-    for i, (leader_pos, follower_pos) in enumerate(zip(leader_positions, follower_targets)):
-        motor_id = i + 1
-        print(f"{motor_id}:{leader_pos}->{follower_pos} ", end="")
+def exit_on_escape():
+    """Shut down when ESC is pressed"""
+    print("\nESC pressed. Exiting...")
+    # sys.exit here would only end the keyboard thread, so the exit is handed to the main thread,
+    # where the SIGINT handler unwinds the loop through main's cleanup
+    _thread.interrupt_main()
+
+def toggle_teleoperation():
+    """Pause or resume sending leader positions to the follower"""
+    global teleoperation_active
+    with lock:
+        teleoperation_active = not teleoperation_active
+        status = "enabled" if teleoperation_active else "disabled"
+        print(f"\nTeleoperation {status}")
+
+def reset_on_request():
+    """Move the follower back to center when R is pressed"""
+    print("\nResetting to center position...")
+    reset_to_center()
 
-    print(" ", end="\r")  # Extra space to overwrite previous line
-    sys.stdout.flush()
+def toggle_debug_mode():
+    """Turn the debug output on or off"""
+    global DEBUG_MODE
+    with lock:
+        DEBUG_MODE = not DEBUG_MODE
+        print(f"\nDebug mode {'enabled' if DEBUG_MODE else 'disabled'}")
+
+# Keyboard controls and the function each one runs
+KEY_ACTIONS = {
+    'esc': exit_on_escape,
+    'space': toggle_teleoperation,
+    'r': reset_on_request,
+    'd': toggle_debug_mode,
+    'c': calibrate_offset,
+    't': test_follower_arm,
+    'p': ping_all_motors,
+}
 
 def monitor_keyboard_input():
-    """Monitor for keyboard input in a separate thread"""
-    global teleoperation_active, DEBUG_MODE
+    """Handle keyboard input in a separate thread, which sleeps until a key is pressed"""
+    # The keyboard hooks only queue the key, so a slow action such as a test doesn't hold up the
+    # keyboard library's own listener. Firing on release gives one action per press, which is
+    # what the old 0.3 s debounce was for.
+    pressed_keys = queue.Queue()
+    for key in KEY_ACTIONS:
+        keyboard.add_hotkey(key, pressed_keys.put, args=(key,), trigger_on_release=True)
 
     while True:
-        if keyboard.is_pressed('esc'):
-            print("\nESC pressed. Exiting...")
-            signal_handler(None, None)
-
-        elif keyboard.is_pressed('space'):
-            with lock:
-                teleoperation_active = not teleoperation_active
-                status = "enabled" if teleoperation_active else "disabled"
-                print(f"\nTeleoperation {status}")
-            time.sleep(0.3)  # Debounce
-
-        elif keyboard.is_pressed('r'):
-            print("\nResetting to center position...")
-            reset_to_center()
-            time.sleep(0.3)  # Debounce
-
-        elif keyboard.is_pressed('d'):
-            with lock:
-                DEBUG_MODE = not DEBUG_MODE
-                print(f"\nDebug mode {'enabled' if DEBUG_MODE else 'disabled'}")
-            time.sleep(0.3)  # Debounce
-
-        elif keyboard.is_pressed('c'):
-            calibrate_offset()
-            time.sleep(0.3)  # Debounce
-
-        elif keyboard.is_pressed('t'):
-            test_follower_arm()
-            time.sleep(0.3)  # Debounce
-
-        elif keyboard.is_pressed('p'):
-            ping_all_motors()
-            time.sleep(0.3)  # Debounce
-
-        time.sleep(0.1)
+        KEY_ACTIONS[pressed_keys.get()]()
+
+def raise_priority():
+    """Run the teleoperation loop at real-time-ish priority so background processes can't delay a tick
+
+    Best effort: without the rights to change it, the process keeps its normal priority.
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), 0x00000080)  # HIGH_PRIORITY_CLASS
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15)  # THREAD_PRIORITY_TIME_CRITICAL
+        else:
+            # Threads started afterwards inherit the policy, so the port threads get it too
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+    except (OSError, AttributeError) as e:
+        print(f"Could not raise process priority: {e}")
 
 def main():
     # Set up signal handler for graceful exit
     signal.signal(signal.SIGINT, signal_handler)
+    raise_priority()
 
     print("=== SO-101 Direct Teleoperation Script ===")
 
@@ -556,96 +789,129 @@ def main():
         print("Failed to open ports. Exiting...")
         return
 
-    print_instructions()
+    # Everything from here on exits through the finally below, which stops the port threads before
+    # their ports close
+    leader_reader = follower_writer = None
+    try:
+        print_instructions()
 
-    # Test communication
-    leader_success, follower_success = ping_all_motors()
+        # Test communication
+        leader_success, follower_success = ping_all_motors()
 
-    if leader_success == 0:
-        print("No leader motors responding. Check connections and power.")
-        close_ports()
-        return
+        if leader_success == 0:
+            print("No leader motors responding. Check connections and power.")
+            return
 
-    if follower_success == 0:
-        print("No follower motors responding. Check connections and power.")
-        close_ports()
-        return
+        if follower_success == 0:
+            print("No follower motors responding. Check connections and power.")
+            return
 
-    # Enable motors on follower arm
-    print("\nEnabling follower motors...")
-    enable_all_follower_motors()
+        # Enable motors on follower arm
+        print("\nEnabling follower motors...")
+        enable_all_follower_motors()
 
-    # Calibrate offsets initially
-    calibrate_offset()
+        # Calibrate offsets initially
+        calibrate_offset()
 
-    # Test follower arm
-    test_follower_arm()
+        # Test follower arm
+        test_follower_arm()
 
-    # Start keyboard monitoring in a separate thread
-    keyboard_thread = threading.Thread(target=monitor_keyboard_input, daemon=True)
-    keyboard_thread.start()
+        # Start keyboard monitoring in a separate thread
+        keyboard_thread = threading.Thread(target=monitor_keyboard_input, daemon=True)
+        keyboard_thread.start()
 
-    # Reset to center to start
-    reset_to_center()
+        # Reset to center to start
+        reset_to_center()
 
-    # Main loop
-    print("\nStarting teleoperation. Move the leader arm to control the follower.")
+        # Main loop
+        print("\nStarting teleoperation. Move the leader arm to control the follower.")
 
-    # Smooth the position changes with a simple moving average
-    smoothed_positions = read_leader_positions()
-    previous_positions = smoothed_positions.copy()
+        # Read the leader and write the follower on their own threads, so each tick's follower write
+        # overlaps the next leader read instead of waiting for it
+        leader_reader = LeaderReader()
+        leader_reader.start()
+        follower_writer = FollowerWriter()
+        follower_writer.start()
+
+        # Smooth the position changes with a simple moving average
+        alpha = 0.2  # Low value = more smoothing
+        leader_positions = np.empty(len(MOTOR_IDS), dtype=np.int32)  # Refilled in place every tick
+        # Positions fit easily in float32; all three buffers are allocated once and updated in place
+        smoothed_positions = leader_reader.latest(leader_positions).astype(np.float32)
+        previous_positions = smoothed_positions.copy()
+        step = np.empty_like(smoothed_positions)  # Scratch for the smoothing and change arithmetic
+
+        tick = 0
+        next_tick = time.perf_counter()
 
-    try:
         while True:
+            tick += 1
             try:
                 with lock:
                     current_teleoperation_active = teleoperation_active
 
-                # Read leader positions
-                leader_positions = read_leader_positions()
+                # Latest leader positions
+                leader_reader.latest(leader_positions)
 
-                # Apply smoothing only if values have changed significantly
-                alpha = 0.2  # Low value = more smoothing
-                smoothed_positions = [
-                    alpha * current + (1 - alpha) * smoothed
-                    for current, smoothed in zip(leader_positions, smoothed_positions)
-                ]
+                # Apply smoothing only if values have changed significantly: an exponential moving
+                # average, smoothed += alpha * (leader - smoothed)
+                np.subtract(leader_positions, smoothed_positions, out=step)
+                step *= alpha
+                smoothed_positions += step
 
-                # Only send commands if position has changed enough
-                position_changed = False
-                for i, (current, previous) in enumerate(zip(smoothed_positions, previous_positions)):
-                    if abs(current - previous) > 5:  # Threshold to avoid unnecessary commands
-                        position_changed = True
-                        break
+                # Only send commands to the motors whose position has changed enough; usually just
+                # one or two joints move at a time. The mask is handed to the follower writer, so
+                # it is the one array made per tick.
+                np.subtract(smoothed_positions, previous_positions, out=step)
+                np.abs(step, out=step)
+                changed = step > 5  # Threshold to avoid unnecessary commands
 
-                if current_teleoperation_active and position_changed:
-                    # Apply offsets to convert leader positions to follower positions
-                    follower_positions = [(int(pos) + offset) % 4096
-                                         for pos, offset in zip(smoothed_positions, position_offsets)]
+                if current_teleoperation_active and changed.any():
+                    # Apply offsets to convert leader positions to follower positions; positions
+                    # wrap at 4096, a power of two, so masking with 0xFFF takes the modulo
+                    follower_positions = (smoothed_positions.astype(np.int32) + position_offsets) & 0xFFF
 
                     # Send positions to follower
-                    set_follower_positions(follower_positions)
+                    follower_writer.submit(follower_positions, changed)
+
+                    # Update previous positions of the motors that were sent; the others keep
+                    # accumulating drift until it crosses the threshold
+                    np.copyto(previous_positions, smoothed_positions, where=changed)
 
-                    # Update previous positions
-                    previous_positions = smoothed_positions.copy()
+                # Sync writes get no reply, so the loop never reads the follower port. Anything that
+                # does arrive there, like the acknowledgements of the test's single writes, is
+                # thrown away now and then rather than checked for after every write.
+                if tick % DRAIN_INTERVAL_TICKS == 0 and DIRECT_MODE and follower_serial:
+                    with follower_lock:
+                        follower_serial.reset_input_buffer()
 
                 # Print status periodically (every ~10 cycles)
-                if not DEBUG_MODE and teleoperation_active:
+                if tick % STATUS_INTERVAL_TICKS == 0 and not DEBUG_MODE and teleoperation_active:
                     print_status(leader_positions, current_teleoperation_active)
 
             except Exception as e:
                 if DEBUG_MODE:
                     print(f"Error in main loop: {e}")
 
-            time.sleep(UPDATE_FREQUENCY)
+            # Sleep until the next tick is due rather than a fixed period, so the time the tick took
+            # comes out of the wait. After an overrun, restart the schedule instead of bursting.
+            next_tick += UPDATE_FREQUENCY
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
 
     except KeyboardInterrupt:
         print("\nProgram interrupted.")
 
     finally:
-        # Clean up
-        disable_all_motors()
-        close_ports()
+        # Clean up, stopping the port threads before their ports close
+        if leader_reader:
+            leader_reader.stop()
+        if follower_writer:
+            follower_writer.stop()
+        shutdown()
         print("Program terminated.")
 
 if __name__ == "__main__":
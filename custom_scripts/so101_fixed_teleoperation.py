@@ -41,6 +41,8 @@ except ImportError:
     print("Failed to import scservo_sdk. Make sure it's installed.")
     sys.exit(1)
 
+from scs_protocol import set_port_low_latency
+
 # Port settings
 LEADER_PORT = "COM3"
 FOLLOWER_PORT = "COM4"
@@ -85,6 +87,14 @@ MOTOR_NAMES = {
 # Lock for thread safety
 lock = threading.Lock()
 
+# GroupSyncRead/GroupSyncWrite handlers by (port, address, length, motor IDs), built on first use and
+# reused every cycle
+sync_readers = {}
+sync_writers = {}
+
+# Last position each motor reported, by (port, motor ID), reused when a read of that motor fails
+last_positions = {}
+
 def signal_handler(sig, frame):
     """Clean up on exit"""
     print("\nExiting program...")
@@ -105,6 +115,9 @@ def open_ports():
 
         if leader_port_handler.setBaudRate(BAUDRATE):
             print(f"✓ Changed leader baudrate to {BAUDRATE}")
+            # Without this every reply waits out the adapter's 16 ms latency timer. setBaudRate
+            # reopens the port, so it has to come afterwards.
+            set_port_low_latency(leader_port_handler)
         else:
             print(f"✗ Failed to change leader baudrate")
             leader_port_handler.closePort()
@@ -124,6 +137,7 @@ def open_ports():
 
         if follower_port_handler.setBaudRate(BAUDRATE):
             print(f"✓ Changed follower baudrate to {BAUDRATE}")
+            set_port_low_latency(follower_port_handler)
         else:
             print(f"✗ Failed to change follower baudrate")
             leader_port_handler.closePort()
@@ -136,29 +150,81 @@ def open_ports():
 
     return True
 
+def get_sync_reader(port_handler, packet_handler, address, length, motor_ids):
+    """Return the cached GroupSyncRead of a register on motor_ids, creating it on first use"""
+    key = (port_handler.port_name, address, length, tuple(motor_ids))
+    group = sync_readers.get(key)
+    if group is None:
+        group = scs.GroupSyncRead(port_handler, packet_handler, address, length)
+        for motor_id in motor_ids:
+            group.addParam(motor_id)
+        sync_readers[key] = group
+    return group
+
+def get_sync_writer(port_handler, packet_handler, address, length):
+    """Return the cached GroupSyncWrite of a register, creating it on first use"""
+    key = (port_handler.port_name, address, length)
+    group = sync_writers.get(key)
+    if group is None:
+        group = scs.GroupSyncWrite(port_handler, packet_handler, address, length)
+        sync_writers[key] = group
+    return group
+
+def sync_read(port_handler, packet_handler, address, length, motor_ids):
+    """Read a register from all motor_ids with one SYNC READ; returns {motor_id: value} for those that answered
+
+    A SYNC READ stops at the first motor that doesn't reply and then reports none of them, so the
+    motors it didn't return are read again one by one.
+    """
+    group = get_sync_reader(port_handler, packet_handler, address, length, motor_ids)
+    result = group.txRxPacket()
+    values = {}
+    if result == scs.COMM_SUCCESS:
+        values = {
+            motor_id: group.getData(motor_id, address, length)
+            for motor_id in motor_ids
+            if group.isAvailable(motor_id, address, length)
+        }
+    elif DEBUG_MODE:
+        print(f"Sync read of address {address} failed: {packet_handler.getTxRxResult(result)}")
+
+    read_register = packet_handler.read2ByteTxRx if length == 2 else packet_handler.read1ByteTxRx
+    for motor_id in motor_ids:
+        if motor_id in values:
+            continue
+        value, result, _ = read_register(port_handler, motor_id, address)
+        if result == scs.COMM_SUCCESS:
+            values[motor_id] = value
+        elif DEBUG_MODE:
+            print(f"Failed to read address {address} from motor {motor_id}: {packet_handler.getTxRxResult(result)}")
+    return values
+
 def read_motor_positions(port_handler, packet_handler, motor_ids):
     """Read position of multiple motors"""
     positions = []
     error_count = 0
 
+    try:
+        read_positions = sync_read(port_handler, packet_handler, 56, 2, motor_ids)  # Read present position (address 56)
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f"Exception reading motor positions: {e}")
+        read_positions = {}
+
     for motor_id in motor_ids:
-        try:
-            position, result, error = packet_handler.read2ByteTxRx(port_handler, motor_id, 56)  # Read present position (address 56)
-            if result == scs.COMM_SUCCESS:
-                positions.append(position)
-                if DEBUG_MODE:
-                    print(f"Read motor {motor_id}: {position}")
-            else:
-                error_msg = packet_handler.getTxRxResult(result)
-                error_count += 1
-                if DEBUG_MODE:
-                    print(f"Failed to read position from motor {motor_id}: {error_msg}")
-                positions.append(2048)  # Use center position as fallback
-        except Exception as e:
+        key = (port_handler.port_name, motor_id)
+        position = read_positions.get(motor_id)
+        if position is not None:
+            last_positions[key] = position
+            positions.append(position)
             if DEBUG_MODE:
-                print(f"Exception reading motor {motor_id}: {e}")
-            positions.append(2048)
+                print(f"Read motor {motor_id}: {position}")
+        else:
             error_count += 1
+            if DEBUG_MODE:
+                print(f"Failed to read position from motor {motor_id}")
+            # Hold the motor's last reading; center is only the fallback before it ever answered
+            positions.append(last_positions.get(key, 2048))
 
     if error_count > 0 and DEBUG_MODE:
         print(f"Warning: {error_count}/{len(motor_ids)} motor reads failed")
@@ -167,30 +233,42 @@ def read_motor_positions(port_handler, packet_handler, motor_ids):
 
 def move_motors(port_handler, packet_handler, motor_ids, positions):
     """Move multiple motors to specified positions"""
-    success_count = 0
+    # One sync read tells which motors have torque enabled (address 50); the others are skipped
+    try:
+        torque = sync_read(port_handler, packet_handler, 50, 1, motor_ids)
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f"Error checking motor torque: {e}")
+        torque = {}
+
+    # Write all goal positions (address 60) with one sync write
+    group = get_sync_writer(port_handler, packet_handler, 60, 2)
+    group.clearParam()
+    commanded = []
     for motor_id, position in zip(motor_ids, positions):
-        if not is_motor_torque_enabled(port_handler, packet_handler, motor_id):
+        if torque.get(motor_id) != 1:
             if DEBUG_MODE:
                 print(f"Motor {motor_id} skipped (torque disabled)")
             continue
 
         # Ensure position is within valid range
         safe_position = max(0, min(4095, int(position)))
+        group.addParam(motor_id, [scs.SCS_LOBYTE(safe_position), scs.SCS_HIBYTE(safe_position)])
+        commanded.append(motor_id)
+        if DEBUG_MODE:
+            print(f"Motor {motor_id} commanded to position {safe_position}")
 
+    success_count = 0
+    if commanded:
         try:
-            # Write goal position (address 60)
-            result, error = packet_handler.write2ByteTxRx(port_handler, motor_id, 60, safe_position)
+            result = group.txPacket()
             if result == scs.COMM_SUCCESS:
-                success_count += 1
-                if DEBUG_MODE:
-                    print(f"Motor {motor_id} commanded to position {safe_position}")
-            else:
-                error_msg = packet_handler.getTxRxResult(result)
-                if DEBUG_MODE:
-                    print(f"Failed to write position to motor {motor_id}: {error_msg}")
+                success_count = len(commanded)
+            elif DEBUG_MODE:
+                print(f"Failed to write positions: {packet_handler.getTxRxResult(result)}")
         except Exception as e:
             if DEBUG_MODE:
-                print(f"Exception moving motor {motor_id}: {e}")
+                print(f"Exception moving motors: {e}")
 
     if DEBUG_MODE and success_count != len(motor_ids):
         print(f"Only {success_count}/{len(motor_ids)} motors were successfully moved")
@@ -726,7 +804,10 @@ def main():
                     current_teleoperation_active = teleoperation_active
 
                 if current_teleoperation_active:
-                    # Read current leader arm positions
+                    # Read current leader arm positions. Whatever is still in the input buffer is a
+                    # late reply to an earlier read; dropping it first means this read's reply is
+                    # the one parsed, so the follower tracks the newest leader pose.
+                    leader_port_handler.ser.reset_input_buffer()
                     current_leader_positions = read_motor_positions(leader_port_handler, leader_packet_handler, MOTOR_IDS)
 
                     # Apply smoothing to reduce jitter